@@ -25,6 +25,9 @@ class OpenSearchOutputArgumentsHelper(interface.ArgumentsHelper):
       'datetime', 'display_name', 'message', 'source_long', 'source_short',
       'tag', 'timestamp', 'timestamp_desc']
 
+  _DEFAULT_BULK_CHUNK_SIZE = 500
+  _DEFAULT_BULK_QUEUE_SIZE = 4
+  _DEFAULT_BULK_THREAD_COUNT = 4
   _DEFAULT_FLUSH_INTERVAL = 1000
   _DEFAULT_INDEX_NAME = uuid4().hex
   _DEFAULT_PORT = 9200
@@ -51,6 +54,26 @@ class OpenSearchOutputArgumentsHelper(interface.ArgumentsHelper):
         action='store', default=cls._DEFAULT_FLUSH_INTERVAL, metavar='INTERVAL',
         help='Events to queue up before bulk insert to OpenSearch.')
 
+    argument_group.add_argument(
+        '--opensearch-bulk-chunk-size', '--opensearch_bulk_chunk_size',
+        dest='opensearch_bulk_chunk_size', type=int, action='store',
+        default=cls._DEFAULT_BULK_CHUNK_SIZE, metavar='SIZE', help=(
+            'Maximum number of events per bulk insert request to '
+            'OpenSearch.'))
+
+    argument_group.add_argument(
+        '--opensearch-bulk-thread-count', '--opensearch_bulk_thread_count',
+        dest='opensearch_bulk_thread_count', type=int, action='store',
+        default=cls._DEFAULT_BULK_THREAD_COUNT, metavar='NUMBER', help=(
+            'Number of threads used for bulk insert requests to OpenSearch.'))
+
+    argument_group.add_argument(
+        '--opensearch-bulk-queue-size', '--opensearch_bulk_queue_size',
+        dest='opensearch_bulk_queue_size', type=int, action='store',
+        default=cls._DEFAULT_BULK_QUEUE_SIZE, metavar='SIZE', help=(
+            'Maximum number of bulk insert requests to OpenSearch pending to '
+            'be handled by the threads.'))
+
     argument_group.add_argument(
         '--opensearch-server', '--opensearch_server', '--server', dest='server',
         type=str, action='store', default=cls._DEFAULT_SERVER,
@@ -118,6 +141,30 @@ class OpenSearchOutputArgumentsHelper(interface.ArgumentsHelper):
         options, 'index_name', default_value=cls._DEFAULT_INDEX_NAME)
     flush_interval = cls._ParseNumericOption(
         options, 'flush_interval', default_value=cls._DEFAULT_FLUSH_INTERVAL)
+    bulk_chunk_size = cls._ParseNumericOption(
+        options, 'opensearch_bulk_chunk_size',
+        default_value=cls._DEFAULT_BULK_CHUNK_SIZE)
+    bulk_thread_count = cls._ParseNumericOption(
+        options, 'opensearch_bulk_thread_count',
+        default_value=cls._DEFAULT_BULK_THREAD_COUNT)
+    bulk_queue_size = cls._ParseNumericOption(
+        options, 'opensearch_bulk_queue_size',
+        default_value=cls._DEFAULT_BULK_QUEUE_SIZE)
+
+    if bulk_chunk_size < 1:
+      raise errors.BadConfigOption(
+          'Invalid OpenSearch bulk chunk size: {0:d}.'.format(
+              bulk_chunk_size))
+
+    if bulk_thread_count < 1:
+      raise errors.BadConfigOption(
+          'Invalid OpenSearch bulk thread count: {0:d}.'.format(
+              bulk_thread_count))
+
+    if bulk_queue_size < 1:
+      raise errors.BadConfigOption(
+          'Invalid OpenSearch bulk queue size: {0:d}.'.format(
+              bulk_queue_size))
 
     mappings_file_path = cls._ParseStringOption(options, 'opensearch_mappings')
     opensearch_user = cls._ParseStringOption(options, 'opensearch_user')
@@ -150,6 +197,8 @@ class OpenSearchOutputArgumentsHelper(interface.ArgumentsHelper):
 
     output_module.SetIndexName(index_name)
     output_module.SetFlushInterval(flush_interval)
+    output_module.SetBulkInsertOptions(
+        bulk_chunk_size, bulk_thread_count, bulk_queue_size)
 
     output_module.SetUsername(opensearch_user)
     output_module.SetPassword(opensearch_password)
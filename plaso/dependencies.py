@@ -28,6 +28,7 @@ PYTHON_DEPENDENCIES = {
     'dtfabric': ('__version__', '20220219', None, True),
     'future': ('__version__', '0.16.0', None, True),
     'lz4': ('__version__', '0.10.0', None, True),
+    'msgspec': ('__version__', '', None, False),
     'opensearchpy': ('__versionstr__', '', None, False),
     'pefile': ('__version__', '2021.5.24', None, True),
     'psutil': ('__version__', '5.4.3', None, True),
@@ -12,6 +12,7 @@ import pytz
 
 from plaso.containers import artifacts
 from plaso.engine import logger
+from plaso.engine import path_helper
 from plaso.helpers.windows import time_zones
 
 
@@ -34,6 +35,7 @@ class KnowledgeBase(object):
     self._user_accounts = {}
     self._values = {}
     self._windows_eventlog_providers = {}
+    self._windows_eventlog_providers_per_path = None
 
   @property
   def available_time_zones(self):
@@ -94,6 +96,7 @@ class KnowledgeBase(object):
           environment_variable.name))
 
     self._environment_variables[name] = environment_variable
+    self._windows_eventlog_providers_per_path = None
 
   def AddUserAccount(self, user_account):
     """Adds an user account.
@@ -131,6 +134,7 @@ class KnowledgeBase(object):
 
     # TODO: store on a per-volume basis?
     self._windows_eventlog_providers[log_source] = windows_eventlog_provider
+    self._windows_eventlog_providers_per_path = None
 
   def GetEnvironmentVariable(self, name):
     """Retrieves an environment variable.
@@ -294,6 +298,39 @@ class KnowledgeBase(object):
     """
     return self._windows_eventlog_providers.values()
 
+  def GetWindowsEventLogProvidersPerPath(self):
+    """Retrieves the Windows EventLog message filenames per path.
+
+    Every message filename is also stored with a ".mui" suffix so that
+    language specific EventLog message files can be looked up directly.
+
+    Returns:
+      dict[str, dict[str, str]]: lower case message filename per lower case
+          lookup filename per lower case message file path.
+    """
+    if self._windows_eventlog_providers_per_path is None:
+      environment_variables = self.GetEnvironmentVariables()
+
+      providers_per_path = {}
+      for provider in self._windows_eventlog_providers.values():
+        for windows_path in provider.event_message_files or []:
+          path, filename = path_helper.PathHelper.GetWindowsSystemPath(
+              windows_path, environment_variables)
+
+          # Use the path prefix as the key to handle language specific EventLog
+          # message files.
+          providers_per_filename = providers_per_path.setdefault(
+              path.lower(), {})
+
+          # Note that multiple providers can share EventLog message files.
+          filename = filename.lower()
+          providers_per_filename[filename] = filename
+          providers_per_filename.setdefault(filename + '.mui', filename)
+
+      self._windows_eventlog_providers_per_path = providers_per_path
+
+    return self._windows_eventlog_providers_per_path
+
   def HasUserAccounts(self):
     """Determines if the knowledge base contains user accounts.
 
@@ -388,6 +425,7 @@ class KnowledgeBase(object):
     """
     name = environment_variable.name.upper()
     self._environment_variables[name] = environment_variable
+    self._windows_eventlog_providers_per_path = None
 
   def SetHostname(self, hostname):
     """Sets a hostname.
@@ -20,8 +20,8 @@ class EventDataTimeliner(object):
 
   Attributes:
     number_of_produced_events (int): number of produced events.
-    parsers_counter (collections.Counter): number of events per parser or
-        parser plugin.
+    parsers_counter (collections.defaultdict[str, int]): number of events per
+        parser or parser plugin.
   """
 
   _DEFAULT_TIME_ZONE = pytz.UTC
@@ -49,7 +49,7 @@ class EventDataTimeliner(object):
     self._time_zone = None
 
     self.number_of_produced_events = 0
-    self.parsers_counter = collections.Counter()
+    self.parsers_counter = collections.defaultdict(int)
 
     self._ReadConfigurationFile()
 
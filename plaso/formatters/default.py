@@ -15,6 +15,11 @@ class DefaultEventFormatter(interface.BasicEventFormatter):
   FORMAT_STRING = '<WARNING DEFAULT FORMATTER> Attributes: {attribute_values}'
   FORMAT_STRING_SHORT = '<DEFAULT> {attribute_values}'
 
+  # Types of event values that are not included in the attribute values.
+  _IGNORED_VALUE_TYPES = (
+      containers_interface.AttributeContainerIdentifier,
+      dfdatetime_interface.DateTimeValues)
+
   def __init__(self):
     """Initializes a default event formatter."""
     super(DefaultEventFormatter, self).__init__(
@@ -31,21 +36,15 @@ class DefaultEventFormatter(interface.BasicEventFormatter):
     Returns:
       str: formatted message.
     """
-    text_pieces = []
-    for name, value in event_values.items():
-      # Ignore reserved variable names.
-      if name in definitions.RESERVED_VARIABLE_NAMES:
-        continue
-
-      # Ignore attribute container identifier values.
-      if isinstance(value, containers_interface.AttributeContainerIdentifier):
-        continue
-
-      # Ignore date and time values.
-      if isinstance(value, dfdatetime_interface.DateTimeValues):
-        continue
-
-      text_pieces.append('{0:s}: {1!s}'.format(name, value))
+    reserved_variable_names = definitions.RESERVED_VARIABLE_NAMES
+    ignored_value_types = self._IGNORED_VALUE_TYPES
+
+    # Ignore reserved variable names, attribute container identifier values
+    # and date and time values.
+    text_pieces = [
+        name + ': ' + str(value) for name, value in event_values.items()
+        if name not in reserved_variable_names and
+        not isinstance(value, ignored_value_types)]
 
     return super(DefaultEventFormatter, self)._FormatMessage(
         format_string, {'attribute_values': ' '.join(text_pieces)})
@@ -438,6 +438,7 @@ class OutputAndFormattingMultiProcessEngine(engine.MultiProcessEngine):
     last_macb_group_identifier = None
     last_content_identifier = None
     macb_group = []
+    writes_events = output_module.WRITES_EVENTS
 
     generator = self._export_event_heap.PopEvents()
 
@@ -447,6 +448,16 @@ class OutputAndFormattingMultiProcessEngine(engine.MultiProcessEngine):
         self._events_status.number_of_duplicate_events += 1
         continue
 
+      # Output modules that do not write events, such as the null output
+      # module, do not need the event tag to be read and events to be grouped.
+      if not writes_events:
+        if macb_group_identifier is not None:
+          self._events_status.number_of_macb_grouped_events += 1
+
+        last_macb_group_identifier = macb_group_identifier
+        last_content_identifier = content_identifier
+        continue
+
       event_identifier = event.GetIdentifier()
       event_tag = storage_reader.GetEventTagByEventIdentifer(event_identifier)
 
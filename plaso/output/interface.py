@@ -20,6 +20,9 @@ class OutputModule(object):
   # Value to indicate the output module supports outputting custom fields.
   SUPPORTS_CUSTOM_FIELDS = False
 
+  # Value to indicate the output module writes events.
+  WRITES_EVENTS = True
+
   # Value to indicate the output module writes to an output file.
   WRITES_OUTPUT_FILE = False
 
@@ -11,6 +11,8 @@ class NullOutputModule(interface.OutputModule):
   NAME = 'null'
   DESCRIPTION = 'Output module that does not output anything.'
 
+  WRITES_EVENTS = False
+
   # pylint: disable=unused-argument
   def WriteEventBody(
       self, output_mediator, event, event_data, event_data_stream, event_tag):
@@ -9,10 +9,17 @@ from dfdatetime import posix_time as dfdatetime_posix_time
 
 from dfvfs.serializer.json_serializer import JsonPathSpecSerializer
 
+try:
+  import msgspec
+except ImportError:
+  msgspec = None
+
 try:
   import opensearchpy
+  from opensearchpy import helpers as opensearchpy_helpers
 except ImportError:
   opensearchpy = None
+  opensearchpy_helpers = None
 
 from plaso.containers import interface as containers_interface
 from plaso.lib import errors
@@ -27,6 +34,49 @@ if opensearchpy:
   opensearch_logger.setLevel(logging.WARNING)
 
 
+if opensearchpy and msgspec:
+
+  class MsgspecJSONSerializer(opensearchpy.JSONSerializer):
+    """OpenSearch JSON serializer that uses msgspec to encode data.
+
+    Data that msgspec cannot encode, such as dictionaries with boolean or None
+    keys, is serialized by the json based serializer instead. Note that msgspec
+    encodes NaN and infinity floating-point values as null, where json encodes
+    them as the invalid JSON tokens NaN and Infinity.
+    """
+
+    def __init__(self):
+      """Initializes a JSON serializer."""
+      super(MsgspecJSONSerializer, self).__init__()
+      self._encoder = msgspec.json.Encoder(enc_hook=self.default)
+
+    def dumps(self, data):
+      """Serializes data to JSON.
+
+      Args:
+        data (object): data to serialize.
+
+      Returns:
+        str: JSON serialized data.
+
+      Raises:
+        SerializationError: if the data cannot be serialized.
+      """
+      # Strings are considered already serialized.
+      if isinstance(data, str):
+        return data
+
+      try:
+        return self._encoder.encode(data).decode('utf-8')
+      except TypeError:
+        return super(MsgspecJSONSerializer, self).dumps(data)
+      except (ValueError, msgspec.EncodeError) as exception:
+        raise opensearchpy.exceptions.SerializationError(data, exception)
+
+else:
+  MsgspecJSONSerializer = None
+
+
 class SharedOpenSearchFieldFormattingHelper(
     formatting_helper.FieldFormattingHelper):
   """Shared OpenSearch output module field formatting helper."""
@@ -197,6 +247,14 @@ class SharedOpenSearchOutputModule(interface.OutputModule):
 
   _DEFAULT_FLUSH_INTERVAL = 1000
 
+  # Number of event documents per bulk request.
+  _DEFAULT_CHUNK_SIZE = 500
+
+  # Number of threads and size of the task queue used for parallel bulk
+  # requests.
+  _DEFAULT_QUEUE_SIZE = 4
+  _DEFAULT_THREAD_COUNT = 4
+
   # Number of seconds to wait before a request to OpenSearch is timed out.
   _DEFAULT_REQUEST_TIMEOUT = 300
 
@@ -213,6 +271,8 @@ class SharedOpenSearchOutputModule(interface.OutputModule):
   def __init__(self):
     """Initializes an output module."""
     super(SharedOpenSearchOutputModule, self).__init__()
+    self._ca_certs = None
+    self._chunk_size = self._DEFAULT_CHUNK_SIZE
     self._client = None
     self._custom_fields = {}
     self._event_documents = []
@@ -225,10 +285,11 @@ class SharedOpenSearchOutputModule(interface.OutputModule):
     self._number_of_buffered_events = 0
     self._password = None
     self._port = None
+    self._queue_size = self._DEFAULT_QUEUE_SIZE
+    self._thread_count = self._DEFAULT_THREAD_COUNT
+    self._url_prefix = None
     self._username = None
     self._use_ssl = None
-    self._ca_certs = None
-    self._url_prefix = None
 
   def _Connect(self):
     """Connects to an OpenSearch server.
@@ -246,11 +307,18 @@ class SharedOpenSearchOutputModule(interface.OutputModule):
     if self._username is not None:
       opensearch_http_auth = (self._username, self._password)
 
+    opensearch_arguments = {
+        'ca_certs': self._ca_certs,
+        'http_auth': opensearch_http_auth,
+        'use_ssl': self._use_ssl}
+
+    # Use msgspec, if available, since it is considerably faster than the
+    # standard json module at encoding the bulk request documents.
+    if MsgspecJSONSerializer:
+      opensearch_arguments['serializer'] = MsgspecJSONSerializer()
+
     self._client = opensearchpy.OpenSearch(
-        [opensearch_host],
-        http_auth=opensearch_http_auth,
-        use_ssl=self._use_ssl,
-        ca_certs=self._ca_certs)
+        [opensearch_host], **opensearch_arguments)
 
     logger.debug((
         'Connected to OpenSearch server: {0:s} port: {1:d} URL prefix: '
@@ -277,21 +345,42 @@ class SharedOpenSearchOutputModule(interface.OutputModule):
               exception))
 
   def _FlushEvents(self):
-    """Inserts the buffered event documents into OpenSearch."""
-    try:
-      # pylint: disable=unexpected-keyword-arg
-      bulk_arguments = {
-          'body': self._event_documents,
-          'index': self._index_name,
-          'request_timeout': self._DEFAULT_REQUEST_TIMEOUT}
+    """Inserts the buffered event documents into OpenSearch.
 
-      self._client.bulk(**bulk_arguments)
-
-    except (ValueError,
-            opensearchpy.exceptions.OpenSearchException) as exception:
-      # Ignore problematic events
-      logger.warning('Unable to bulk insert with error: {0!s}'.format(
-          exception))
+    The event documents are split into chunks that are inserted by multiple
+    threads using parallel bulk requests.
+    """
+    if self._event_documents:
+      number_of_failed_events = 0
+
+      # Reduce the chunk size when fewer event documents are buffered than
+      # needed to fill a chunk per thread, so that all threads are used.
+      chunk_size = -(-len(self._event_documents) // self._thread_count)
+      chunk_size = max(1, min(chunk_size, self._chunk_size))
+
+      try:
+        # Note that parallel_bulk returns a generator that needs to be
+        # consumed for the bulk requests to be executed.
+        for result, item in opensearchpy_helpers.parallel_bulk(
+            self._client, self._event_documents,
+            chunk_size=chunk_size, queue_size=self._queue_size,
+            raise_on_error=False, raise_on_exception=False,
+            request_timeout=self._DEFAULT_REQUEST_TIMEOUT,
+            thread_count=self._thread_count):
+          if not result:
+            number_of_failed_events += 1
+            logger.debug('Unable to insert event with error: {0!s}'.format(
+                item))
+
+      except (ValueError,
+              opensearchpy.exceptions.OpenSearchException) as exception:
+        # Ignore problematic events
+        logger.warning('Unable to bulk insert with error: {0!s}'.format(
+            exception))
+
+      if number_of_failed_events:
+        logger.warning('Unable to insert {0:d} events into OpenSearch'.format(
+            number_of_failed_events))
 
     logger.debug('Inserted {0:d} events into OpenSearch'.format(
         self._number_of_buffered_events))
@@ -387,13 +476,11 @@ class SharedOpenSearchOutputModule(interface.OutputModule):
       event_data_stream (EventDataStream): event data stream.
       event_tag (EventTag): event tag.
     """
-    event_document = {'index': {'_index': self._index_name}}
-
     event_values = self._GetSanitizedEventValues(
         output_mediator, event, event_data, event_data_stream, event_tag)
 
-    self._event_documents.append(event_document)
-    self._event_documents.append(event_values)
+    self._event_documents.append({
+        '_index': self._index_name, '_source': event_values})
     self._number_of_buffered_events += 1
 
     if self._number_of_buffered_events > self._flush_interval:
@@ -437,6 +524,22 @@ class SharedOpenSearchOutputModule(interface.OutputModule):
     """
     self._field_names.extend(field_names)
 
+  def SetBulkInsertOptions(self, chunk_size, thread_count, queue_size):
+    """Sets the bulk insert options.
+
+    Args:
+      chunk_size (int): number of event documents per bulk request.
+      thread_count (int): number of threads used for bulk requests.
+      queue_size (int): size of the queue of bulk requests pending to be
+          handled by the threads.
+    """
+    self._chunk_size = chunk_size
+    self._queue_size = queue_size
+    self._thread_count = thread_count
+    logger.debug((
+        'OpenSearch bulk insert chunk size: {0:d}, thread count: {1:d}, '
+        'queue size: {2:d}').format(chunk_size, thread_count, queue_size))
+
   def SetCustomFields(self, field_names_and_values):
     """Sets the names and values of custom fields to output.
 
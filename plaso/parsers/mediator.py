@@ -3,6 +3,8 @@
 
 import collections
 import datetime
+import functools
+import sys
 import time
 
 import pytz
@@ -22,16 +24,31 @@ class ParserMediator(object):
     collection_filters_helper (CollectionFiltersHelper): collection filters
         helper.
     last_activity_timestamp (int): timestamp received that indicates the last
-        time activity was observed. The last activity timestamp is updated
-        when the mediator produces an attribute container, such as an event
-        source. This timestamp is used by the multi processing worker process
-        to indicate the last time the worker was known to be active. This
+        time activity was observed. The last activity timestamp is updated,
+        at most every 100 ms, when the mediator produces attribute containers,
+        such as event sources, and when a parser or parser plugin finishes.
+        This timestamp is used by the multi processing worker process to
+        indicate the last time the worker was known to be active. This
         information is then used by the foreman to detect workers that are
         not responding (stalled).
-    parsers_counter (collections.Counter): number of events per parser or
-        parser plugin.
+    parsers_counter (collections.defaultdict[str, int]): number of events per
+        parser or parser plugin.
   """
 
+  __slots__ = (
+      '_abort', '_cpu_time_profiler', '_current_year',
+      '_current_year_timestamp', '_event_data_stream_identifier',
+      '_extract_winevt_resources', '_file_entry', '_filename',
+      '_knowledge_base', '_language_tag', '_last_activity_monotonic_timestamp',
+      '_last_event_data_hash', '_last_event_data_identifier', '_lcid',
+      '_memory_profiler', '_number_of_event_data', '_number_of_event_sources',
+      '_number_of_extraction_warnings', '_number_of_recovery_warnings',
+      '_parser_chain', '_parser_chain_offsets', '_path_segment_separator',
+      '_preferred_codepage', '_process_information', '_profiling_enabled',
+      '_relative_path', '_resolver_context', '_storage_writer',
+      '_temporary_directory', '_text_prepend', '_time_zone',
+      'collection_filters_helper', 'last_activity_timestamp', 'parsers_counter')
+
   _DEFAULT_LANGUAGE_TAG = 'en-US'
 
   # LCID 0x0409 is en-US.
@@ -39,9 +56,15 @@ class ParserMediator(object):
 
   _DEFAULT_TIME_ZONE = pytz.UTC
 
+  # Number of seconds after which the cached current year is refreshed.
+  _CURRENT_YEAR_REFRESH_INTERVAL = 3600
+
   _INT64_MIN = -1 << 63
   _INT64_MAX = (1 << 63) - 1
 
+  # Minimum number of seconds between updates of the last activity timestamp.
+  _LAST_ACTIVITY_TIMESTAMP_UPDATE_INTERVAL = 0.1
+
   def __init__(
       self, knowledge_base, collection_filters_helper=None,
       resolver_context=None):
@@ -56,13 +79,16 @@ class ParserMediator(object):
     """
     super(ParserMediator, self).__init__()
     self._abort = False
-    self._cached_parser_chain = None
     self._cpu_time_profiler = None
+    self._current_year = None
+    self._current_year_timestamp = 0.0
     self._event_data_stream_identifier = None
     self._extract_winevt_resources = True
     self._file_entry = None
+    self._filename = None
     self._knowledge_base = knowledge_base
     self._language_tag = self._DEFAULT_LANGUAGE_TAG
+    self._last_activity_monotonic_timestamp = None
     self._last_event_data_hash = None
     self._last_event_data_identifier = None
     self._lcid = self._DEFAULT_LCID
@@ -71,19 +97,22 @@ class ParserMediator(object):
     self._number_of_event_sources = 0
     self._number_of_extraction_warnings = 0
     self._number_of_recovery_warnings = 0
-    self._parser_chain_components = []
-    self._preferred_codepage = None
+    self._parser_chain = ''
+    self._parser_chain_offsets = []
+    self._path_segment_separator = '/'
+    self._preferred_codepage = self._GetKnowledgeBaseCodepage()
     self._process_information = None
+    self._profiling_enabled = False
+    self._relative_path = None
     self._resolver_context = resolver_context
     self._storage_writer = None
     self._temporary_directory = None
     self._text_prepend = None
-    self._time_zone = None
-    self._windows_event_log_providers_per_path = None
+    self._time_zone = self._GetKnowledgeBaseTimeZone()
 
     self.collection_filters_helper = collection_filters_helper
     self.last_activity_timestamp = 0.0
-    self.parsers_counter = collections.Counter()
+    self.parsers_counter = collections.defaultdict(int)
 
   @property
   def abort(self):
@@ -93,8 +122,6 @@ class ParserMediator(object):
   @property
   def codepage(self):
     """str: preferred codepage in lower case."""
-    if not self._preferred_codepage:
-      self._preferred_codepage = self._knowledge_base.codepage.lower()
     return self._preferred_codepage
 
   @property
@@ -105,11 +132,6 @@ class ParserMediator(object):
   @property
   def language(self):
     """str: language tag in lower case."""
-    if not self._language_tag:
-      language_tag = (
-          self._knowledge_base.language.lower() or self._DEFAULT_LANGUAGE_TAG)
-      self._language_tag = language_tag.lower()
-
     return self._language_tag
 
   @property
@@ -140,11 +162,97 @@ class ParserMediator(object):
   @property
   def timezone(self):
     """datetime.tzinfo: timezone."""
-    if not self._time_zone:
-      self._time_zone = self._knowledge_base.timezone or self._DEFAULT_TIME_ZONE
-
     return self._time_zone
 
+  def _GetKnowledgeBaseCodepage(self):
+    """Retrieves the codepage determined by preprocessing.
+
+    Returns:
+      str: codepage in lower case or None if not available.
+    """
+    if self._knowledge_base is None:
+      return None
+
+    return self._knowledge_base.codepage.lower()
+
+  def _GetKnowledgeBaseLanguageTag(self):
+    """Retrieves the language tag determined by preprocessing.
+
+    Returns:
+      str: language tag in lower case, where the default language tag is used
+          if not available.
+    """
+    language_tag = None
+    if self._knowledge_base is not None:
+      language_tag = self._knowledge_base.language
+
+    return (language_tag or self._DEFAULT_LANGUAGE_TAG).lower()
+
+  def _GetKnowledgeBaseTimeZone(self):
+    """Retrieves the time zone determined by preprocessing.
+
+    Returns:
+      datetime.tzinfo: time zone, where the default time zone is used if not
+          available.
+    """
+    time_zone = None
+    if self._knowledge_base is not None:
+      time_zone = self._knowledge_base.timezone
+
+    return time_zone or self._DEFAULT_TIME_ZONE
+
+  @staticmethod
+  @functools.lru_cache(maxsize=64)
+  def _GetLCIDForLanguageTag(language_tag):
+    """Retrieves the LCID for a specific language tag.
+
+    Args:
+      language_tag (str): language tag.
+
+    Returns:
+      int: Windows NT language identifier (LCID) or None if not available.
+    """
+    return languages.WindowsLanguageHelper.GetLCIDForLanguageTag(language_tag)
+
+  @staticmethod
+  @functools.lru_cache(maxsize=64)
+  def _GetTimeZone(time_zone_string):
+    """Retrieves a time zone.
+
+    Args:
+      time_zone_string (str): time zone such as "Europe/Amsterdam".
+
+    Returns:
+      datetime.tzinfo: time zone.
+
+    Raises:
+      UnknownTimeZoneError: if the time zone is not supported.
+    """
+    return pytz.timezone(time_zone_string)
+
+  def _AddAttributeContainer(self, container):
+    """Adds an attribute container to the storage writer.
+
+    Args:
+      container (AttributeContainer): attribute container.
+    """
+    self._storage_writer.AddAttributeContainer(container)
+
+    self._UpdateLastActivityTimestamp()
+
+  def _UpdateLastActivityTimestamp(self):
+    """Updates the last activity timestamp.
+
+    The last activity timestamp is only updated when at least 100 ms have
+    passed since the previous update, as determined by the monotonic clock.
+    """
+    monotonic_timestamp = time.monotonic()
+    if (self._last_activity_monotonic_timestamp is None or
+        monotonic_timestamp - self._last_activity_monotonic_timestamp >= (
+            self._LAST_ACTIVITY_TIMESTAMP_UPDATE_INTERVAL)):
+      self._last_activity_monotonic_timestamp = monotonic_timestamp
+      self.last_activity_timestamp = time.time()
+
   def AddYearLessLogHelper(self, year_less_log_helper):
     """Adds a year-less log helper.
 
@@ -187,16 +295,24 @@ class ParserMediator(object):
   def AppendToParserChain(self, name):
     """Adds a parser or parser plugin to the parser chain.
 
+    The parser chain is interned since it is shared by all the attribute
+    containers produced with it.
+
     Args:
       name (str): name of a parser or parser plugin.
     """
-    self._cached_parser_chain = None
-    self._parser_chain_components.append(name)
+    if self._parser_chain_offsets:
+      parser_chain = '/'.join([self._parser_chain, name])
+    else:
+      parser_chain = name
+
+    self._parser_chain_offsets.append(len(self._parser_chain))
+    self._parser_chain = sys.intern(parser_chain)
 
   def ClearParserChain(self):
     """Clears the parser chain."""
-    self._cached_parser_chain = None
-    self._parser_chain_components = []
+    self._parser_chain = ''
+    self._parser_chain_offsets = []
 
   def ExpandWindowsPath(self, path):
     """Expands a Windows path containing environment variables.
@@ -213,11 +329,19 @@ class ParserMediator(object):
   def GetCurrentYear(self):
     """Retrieves current year.
 
+    The current year is cached and refreshed at most once per hour.
+
     Returns:
       int: the current year.
     """
-    datetime_object = datetime.datetime.now()
-    return datetime_object.year
+    timestamp = time.monotonic()
+    if (self._current_year is None or timestamp - self._current_year_timestamp
+        > self._CURRENT_YEAR_REFRESH_INTERVAL):
+      datetime_object = datetime.datetime.now()
+      self._current_year = datetime_object.year
+      self._current_year_timestamp = timestamp
+
+    return self._current_year
 
   def GetDisplayName(self, file_entry=None):
     """Retrieves the display name for a file entry.
@@ -273,14 +397,7 @@ class ParserMediator(object):
     Returns:
       str: name of the active file entry or None.
     """
-    if not self._file_entry:
-      return None
-
-    data_stream = getattr(self._file_entry.path_spec, 'data_stream', None)
-    if data_stream:
-      return '{0:s}:{1:s}'.format(self._file_entry.name, data_stream)
-
-    return self._file_entry.name
+    return self._filename
 
   def GetParserChain(self):
     """Retrieves the current parser chain.
@@ -288,9 +405,7 @@ class ParserMediator(object):
     Returns:
       str: parser chain.
     """
-    if not self._cached_parser_chain:
-      self._cached_parser_chain = '/'.join(self._parser_chain_components)
-    return self._cached_parser_chain
+    return self._parser_chain
 
   def GetRelativePath(self):
     """Retrieves the relative path of the current file entry.
@@ -302,8 +417,11 @@ class ParserMediator(object):
     if self._file_entry is None:
       return None
 
-    return path_helper.PathHelper.GetRelativePathForPathSpec(
-        self._file_entry.path_spec)
+    if self._relative_path is None:
+      self._relative_path = path_helper.PathHelper.GetRelativePathForPathSpec(
+          self._file_entry.path_spec)
+
+    return self._relative_path
 
   def GetRelativePathForPathSpec(self, path_spec):
     """Retrieves the relative path for a path specification.
@@ -324,61 +442,43 @@ class ParserMediator(object):
           if no current file entry or no Windows EventLog message file was
           found.
     """
-    if self._windows_event_log_providers_per_path is None:
-      self._windows_event_log_providers_per_path = {}
-      environment_variables = self._knowledge_base.GetEnvironmentVariables()
-
-      for provider in self._knowledge_base.GetWindowsEventLogProviders():
-        for windows_path in provider.event_message_files or []:
-          path, filename = path_helper.PathHelper.GetWindowsSystemPath(
-              windows_path, environment_variables)
-          path = path.lower()
-          filename = filename.lower()
-
-          # Use the path prefix as the key to handle language specific EventLog
-          # message files.
-          if path not in self._windows_event_log_providers_per_path:
-            self._windows_event_log_providers_per_path[path] = {}
-
-          # Note that multiple providers can share EventLog message files.
-          self._windows_event_log_providers_per_path[path][filename] = provider
-
     message_file = None
     if self._file_entry:
-      relative_path = path_helper.PathHelper.GetRelativePathForPathSpec(
-          self._file_entry.path_spec)
+      relative_path = self.GetRelativePath()
       lookup_path = relative_path.lower()
 
-      path_segment_separator = path_helper.PathHelper.GetPathSegmentSeparator(
-          self._file_entry.path_spec)
-
       lookup_path, _, lookup_filename = lookup_path.rpartition(
-          path_segment_separator)
+          self._path_segment_separator)
 
       # Language specific EventLog message file paths contain a language tag
       # such as "en-US".
       base_lookup_path, _, last_path_segment = lookup_path.rpartition(
-          path_segment_separator)
+          self._path_segment_separator)
       if language_tags.LanguageTagHelper.IsLanguageTag(last_path_segment):
         lookup_path = base_lookup_path
 
-      providers_per_filename = self._windows_event_log_providers_per_path.get(
-          lookup_path, {})
+      providers_per_path = (
+          self._knowledge_base.GetWindowsEventLogProvidersPerPath())
+      providers_per_filename = providers_per_path.get(lookup_path, {})
 
-      for filename, provider in providers_per_filename.items():
-        mui_filename = '{0:s}.mui'.format(filename)
-        if lookup_filename in (filename, mui_filename):
-          windows_path = '\\'.join([lookup_path, filename])
-          message_file = artifacts.WindowsEventLogMessageFileArtifact(
-              path=relative_path, windows_path=windows_path)
-          break
+      filename = providers_per_filename.get(lookup_filename, None)
+      if filename is not None:
+        windows_path = '\\'.join([lookup_path, filename])
+        message_file = artifacts.WindowsEventLogMessageFileArtifact(
+            path=relative_path, windows_path=windows_path)
 
     return message_file
 
   def PopFromParserChain(self):
-    """Removes the last added parser or parser plugin from the parser chain."""
-    self._cached_parser_chain = None
-    self._parser_chain_components.pop()
+    """Removes the last added parser or parser plugin from the parser chain.
+
+    Since a parser or parser plugin has finished, the last activity timestamp
+    is updated as well.
+    """
+    self._UpdateLastActivityTimestamp()
+
+    offset = self._parser_chain_offsets.pop()
+    self._parser_chain = sys.intern(self._parser_chain[:offset])
 
   def ProduceEventData(self, event_data):
     """Produces event data.
@@ -389,22 +489,20 @@ class ParserMediator(object):
     Raises:
       RuntimeError: when storage writer is not set.
     """
-    if not self._storage_writer:
+    if self._storage_writer is None:
       raise RuntimeError('Storage writer not set.')
 
     # TODO: rename this to event_data.parser_chain or equivalent.
     if not event_data.parser:
-      event_data.parser = self.GetParserChain()
+      event_data.parser = self._parser_chain
 
     if self._event_data_stream_identifier:
       event_data.SetEventDataStreamIdentifier(
           self._event_data_stream_identifier)
 
-    self._storage_writer.AddAttributeContainer(event_data)
+    self._AddAttributeContainer(event_data)
     self._number_of_event_data += 1
 
-    self.last_activity_timestamp = time.time()
-
   def ProduceEventDataStream(self, event_data_stream):
     """Produces an event data stream.
 
@@ -415,7 +513,7 @@ class ParserMediator(object):
     Raises:
       RuntimeError: when storage writer is not set.
     """
-    if not self._storage_writer:
+    if self._storage_writer is None:
       raise RuntimeError('Storage writer not set.')
 
     if not event_data_stream:
@@ -429,7 +527,7 @@ class ParserMediator(object):
 
       self._event_data_stream_identifier = event_data_stream.GetIdentifier()
 
-    self.last_activity_timestamp = time.time()
+    self._UpdateLastActivityTimestamp()
 
   def ProduceEventSource(self, event_source):
     """Produces an event source.
@@ -440,14 +538,12 @@ class ParserMediator(object):
     Raises:
       RuntimeError: when storage writer is not set.
     """
-    if not self._storage_writer:
+    if self._storage_writer is None:
       raise RuntimeError('Storage writer not set.')
 
-    self._storage_writer.AddAttributeContainer(event_source)
+    self._AddAttributeContainer(event_source)
     self._number_of_event_sources += 1
 
-    self.last_activity_timestamp = time.time()
-
   def ProduceExtractionWarning(self, message, path_spec=None):
     """Produces an extraction warning.
 
@@ -460,7 +556,7 @@ class ParserMediator(object):
     Raises:
       RuntimeError: when storage writer is not set.
     """
-    if not self._storage_writer:
+    if self._storage_writer is None:
       raise RuntimeError('Storage writer not set.')
 
     if not path_spec and self._file_entry:
@@ -469,11 +565,9 @@ class ParserMediator(object):
     parser_chain = self.GetParserChain()
     warning = warnings.ExtractionWarning(
         message=message, parser_chain=parser_chain, path_spec=path_spec)
-    self._storage_writer.AddAttributeContainer(warning)
+    self._AddAttributeContainer(warning)
     self._number_of_extraction_warnings += 1
 
-    self.last_activity_timestamp = time.time()
-
   def ProduceRecoveryWarning(self, message, path_spec=None):
     """Produces a recovery warning.
 
@@ -486,7 +580,7 @@ class ParserMediator(object):
     Raises:
       RuntimeError: when storage writer is not set.
     """
-    if not self._storage_writer:
+    if self._storage_writer is None:
       raise RuntimeError('Storage writer not set.')
 
     if not path_spec and self._file_entry:
@@ -495,14 +589,15 @@ class ParserMediator(object):
     parser_chain = self.GetParserChain()
     warning = warnings.RecoveryWarning(
         message=message, parser_chain=parser_chain, path_spec=path_spec)
-    self._storage_writer.AddAttributeContainer(warning)
+    self._AddAttributeContainer(warning)
     self._number_of_recovery_warnings += 1
 
-    self.last_activity_timestamp = time.time()
-
   def ResetFileEntry(self):
     """Resets the active file entry."""
     self._file_entry = None
+    self._filename = None
+    self._path_segment_separator = '/'
+    self._relative_path = None
 
   def SampleMemoryUsage(self, parser_name):
     """Takes a sample of the memory usage for profiling.
@@ -510,7 +605,7 @@ class ParserMediator(object):
     Args:
       parser_name (str): name of the parser.
     """
-    if self._memory_profiler:
+    if self._profiling_enabled:
       used_memory = self._process_information.GetUsedMemory() or 0
       self._memory_profiler.Sample(parser_name, used_memory)
 
@@ -520,7 +615,7 @@ class ParserMediator(object):
     Args:
       parser_name (str): name of the parser.
     """
-    if self._cpu_time_profiler:
+    if self._profiling_enabled:
       self._cpu_time_profiler.StartTiming(parser_name)
 
   def SampleStopTiming(self, parser_name):
@@ -529,7 +624,7 @@ class ParserMediator(object):
     Args:
       parser_name (str): name of the parser.
     """
-    if self._cpu_time_profiler:
+    if self._profiling_enabled:
       self._cpu_time_profiler.StopTiming(parser_name)
 
   def SetExtractWinEvtResources(self, extract_winevt_resources):
@@ -547,15 +642,33 @@ class ParserMediator(object):
     Args:
       file_entry (dfvfs.FileEntry): file entry.
     """
+    path_spec = getattr(file_entry, 'path_spec', None)
+
+    filename = None
+    if file_entry:
+      filename = file_entry.name
+
+      data_stream = getattr(path_spec, 'data_stream', None)
+      if data_stream:
+        filename = '{0:s}:{1:s}'.format(filename, data_stream)
+
     self._file_entry = file_entry
     self._event_data_stream_identifier = None
+    self._filename = filename
+    self._path_segment_separator = (
+        path_helper.PathHelper.GetPathSegmentSeparator(path_spec))
+    self._relative_path = None
 
   def SetPreferredCodepage(self, codepage):
     """Sets the preferred codepage.
 
     Args:
-      codepage (str): codepage.
+      codepage (str): codepage or None if the codepage determined by
+          preprocessing should be used.
     """
+    if not codepage:
+      codepage = self._GetKnowledgeBaseCodepage()
+
     self._preferred_codepage = codepage
 
   def SetPreferredLanguage(self, language_tag):
@@ -576,11 +689,14 @@ class ParserMediator(object):
         raise ValueError('Language tag: {0!s} is not a string.'.format(
             language_tag))
 
-      lcid = languages.WindowsLanguageHelper.GetLCIDForLanguageTag(language_tag)
+      lcid = self._GetLCIDForLanguageTag(language_tag)
       if not lcid:
         raise ValueError('No LCID found for language tag: {0:s}.'.format(
             language_tag))
 
+    else:
+      language_tag = self._GetKnowledgeBaseLanguageTag()
+
     self._language_tag = language_tag
     self._lcid = lcid
 
@@ -595,14 +711,16 @@ class ParserMediator(object):
     Raises:
       ValueError: if the time zone is not supported.
     """
-    time_zone = None
     if time_zone_string:
       try:
-        time_zone = pytz.timezone(time_zone_string)
+        time_zone = self._GetTimeZone(time_zone_string)
       except pytz.UnknownTimeZoneError:
         raise ValueError('Unsupported time zone: {0!s}'.format(
             time_zone_string))
 
+    else:
+      time_zone = self._GetKnowledgeBaseTimeZone()
+
     self._time_zone = time_zone
 
   def SetStorageWriter(self, storage_writer):
@@ -661,10 +779,16 @@ class ParserMediator(object):
           identifier, configuration)
       self._memory_profiler.Start()
 
+      # The CPU time and memory profilers are always created together, hence
+      # the sample methods only need to check this flag.
+      self._profiling_enabled = True
+
     self._process_information = process_information
 
   def StopProfiling(self):
     """Stops profiling."""
+    self._profiling_enabled = False
+
     if self._cpu_time_profiler:
       self._cpu_time_profiler.Stop()
       self._cpu_time_profiler = None
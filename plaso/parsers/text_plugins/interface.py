@@ -156,44 +156,45 @@ class TextPlugin(plugins.BasePlugin):
         line = text_reader.ReadLine()
         # Pyparsing does not appear to detect single empty lines hence that
         # we ignore them here.
-        if not line:
-          continue
+        if line:
+          logger.debug('unable to parse string with error: {0!s}'.format(
+              exception))
 
-        logger.debug('unable to parse string with error: {0!s}'.format(
-            exception))
+          if len(line) > 80:
+            line = '{0:s}...'.format(line[:77])
 
-        if len(line) > 80:
-          line = '{0:s}...'.format(line[:77])
+          parser_mediator.ProduceExtractionWarning(
+              'unable to parse log line: {0:d} "{1:s}"'.format(
+                  text_reader.line_number, line))
 
-        parser_mediator.ProduceExtractionWarning(
-            'unable to parse log line: {0:d} "{1:s}"'.format(
-                text_reader.line_number, line))
-
-        consecutive_line_failures += 1
-
-        continue
-
-      consecutive_line_failures = 0
+          consecutive_line_failures += 1
 
-      try:
-        # TODO: use a callback per key.
-        self._ParseRecord(parser_mediator, key, structure)
-
-      except errors.ParseError as exception:
-        parser_mediator.ProduceExtractionWarning(
-            'unable to parse record: {0:s} with error: {1!s}'.format(
-                key, exception))
-
-      text_reader.SkipAhead(end)
-
-      try:
-        text_reader.ReadLines()
-        self._current_offset = text_reader.get_offset()
-      except UnicodeDecodeError as exception:
-        parser_mediator.ProduceExtractionWarning((
-            'unable to read and decode log line at offset {0:d} with error: '
-            '{1!s}').format(self._current_offset, exception))
-        break
+      else:
+        consecutive_line_failures = 0
+
+        try:
+          # TODO: use a callback per key.
+          self._ParseRecord(parser_mediator, key, structure)
+
+        except errors.ParseError as exception:
+          parser_mediator.ProduceExtractionWarning(
+              'unable to parse record: {0:s} with error: {1!s}'.format(
+                  key, exception))
+
+        text_reader.SkipAhead(end)
+
+      # Only read more lines when less than the maximum line length is left,
+      # otherwise the lines buffer keeps growing and every SkipAhead() copies
+      # the remainder of the buffer.
+      if len(text_reader.lines) < self.MAXIMUM_LINE_LENGTH:
+        try:
+          text_reader.ReadLines()
+          self._current_offset = text_reader.get_offset()
+        except UnicodeDecodeError as exception:
+          parser_mediator.ProduceExtractionWarning((
+              'unable to read and decode log line at offset {0:d} with error: '
+              '{1!s}').format(self._current_offset, exception))
+          break
 
   @abc.abstractmethod
   def _ParseRecord(self, parser_mediator, key, structure):
@@ -266,6 +267,10 @@ class TextPlugin(plugins.BasePlugin):
       else:
         self._pyparsing_grammar ^= expression
 
+    # Plugins that override _ParseString do not need to define line structures.
+    if not self._pyparsing_grammar:
+      return
+
     # Override Pyparsing's default replacement of tabs with spaces to
     # SkipAhead() the correct number of bytes after a match.
     self._pyparsing_grammar.parseWithTabs()
@@ -5,6 +5,9 @@ Also see:
   https://learn.microsoft.com/en-us/windows-hardware/drivers/install/setupapi-text-logs
 """
 
+import functools
+import re
+
 import pyparsing
 
 from dfdatetime import time_elements as dfdatetime_time_elements
@@ -46,100 +49,89 @@ class SetupAPILogTextPlugin(interface.TextPlugin):
   NAME = 'setupapi'
   DATA_FORMAT = 'Windows SetupAPI log file'
 
-  _TWO_DIGITS = pyparsing.Word(pyparsing.nums, exact=2).setParseAction(
-      lambda tokens: int(tokens[0], 10))
-
-  _THREE_DIGITS = pyparsing.Word(pyparsing.nums, exact=3).setParseAction(
-      lambda tokens: int(tokens[0], 10))
-
-  _FOUR_DIGITS = pyparsing.Word(pyparsing.nums, exact=4).setParseAction(
-      lambda tokens: int(tokens[0], 10))
-
-  _END_OF_LINE = pyparsing.Suppress(pyparsing.LineEnd())
+  # Section body lines can contain long paths and hardware identifiers. Note
+  # that the maximum line length is also the size of a single read.
+  MAXIMUM_LINE_LENGTH = 4096
 
   # Date and time values are formatted as: 2015/11/22 17:59:28.110
-  _DATE_TIME = pyparsing.Group(
-      _FOUR_DIGITS + pyparsing.Suppress('/') +
-      _TWO_DIGITS + pyparsing.Suppress('/') + _TWO_DIGITS +
-      _TWO_DIGITS + pyparsing.Suppress(':') +
-      _TWO_DIGITS + pyparsing.Suppress(':') + _TWO_DIGITS +
-      pyparsing.Word('.,', exact=1).suppress() + _THREE_DIGITS)
+  _DATE_TIME_PATTERN = (
+      r'([0-9]{4}/[0-9]{2}/[0-9]{2}[ \t]+[0-9]{2}:[0-9]{2}:[0-9]{2}[.,]'
+      r'[0-9]{3})')
 
   # pylint: disable=line-too-long
   # See https://docs.microsoft.com/en-us/windows-hardware/drivers/install/format-of-a-text-log-header
   # pylint: enable=line-too-long
   _LOG_HEADER_START_LINE = (
-      pyparsing.Literal('[Device Install Log]') + _END_OF_LINE)
+      pyparsing.Literal('[Device Install Log]') +
+      pyparsing.Suppress(pyparsing.LineEnd()))
 
-  _LOG_HEADER_BODY_LINE = (
-     pyparsing.oneOf([
-         'Architecture', 'OS Version', 'ProductType', 'Service Pack',
-         'Suite']) +
-     pyparsing.Literal('=') + pyparsing.restOfLine() + _END_OF_LINE)
+  _LOG_HEADER_START_RE = re.compile(r'\[Device Install Log\][ \t]*$')
 
-  _LOG_HEADER_END_LINE = (
-      pyparsing.Literal('[BeginLog]') + _END_OF_LINE)
+  _LOG_HEADER_BODY_RE = re.compile(
+      r'[ \t]*(Architecture|OS Version|ProductType|Service Pack|Suite)'
+      r'[ \t]*=')
+
+  _LOG_HEADER_END_RE = re.compile(r'\[BeginLog\][ \t]*$')
 
   # pylint: disable=line-too-long
   # See https://docs.microsoft.com/en-us/windows-hardware/drivers/install/format-of-a-text-log-section-header
   # pylint: enable=line-too-long
-  _SECTION_HEADER_LINE = (
-      pyparsing.Suppress('>>>  [') +
-      pyparsing.CharsNotIn(']').setResultsName('entry_type') +
-      pyparsing.Suppress(']') + _END_OF_LINE)
+  _SECTION_HEADER_RE = re.compile(r'>>>  \[([^\]]+)\][ \t]*$')
 
-  _SECTION_HEADER_START_LINE = (
-      pyparsing.Suppress('>>>  Section start') +
-      _DATE_TIME.setResultsName('start_time') +
-      _END_OF_LINE)
+  _SECTION_HEADER_START_RE = re.compile(
+      r'>>>  Section start[ \t]+' + _DATE_TIME_PATTERN + r'[ \t]*$')
 
   # pylint: disable=line-too-long
   # See https://docs.microsoft.com/en-us/windows-hardware/drivers/install/format-of-a-text-log-section-footer
   # pylint: enable=line-too-long
-  _SECTION_END_LINE = (
-      pyparsing.Suppress('<<<  Section end ') +
-      _DATE_TIME.setResultsName('end_time') +
-      _END_OF_LINE)
+  _SECTION_END_RE = re.compile(
+      r'<<<  Section end[ \t]+' + _DATE_TIME_PATTERN + r'[ \t]*$')
 
-  _SECTION_END_EXIT_STATUS_LINE = (
-      pyparsing.Suppress('<<<  [Exit status: ') +
-      pyparsing.CharsNotIn(']').setResultsName('exit_status') +
-      pyparsing.Literal(']') +
-      _END_OF_LINE)
+  _SECTION_END_EXIT_STATUS_RE = re.compile(
+      r'<<<  \[Exit status: ([^\]]+)\][ \t]*$')
 
   # pylint: disable=line-too-long
   # See https://learn.microsoft.com/en-us/windows-hardware/drivers/install/format-of-a-text-log-section-body
   # and https://docs.microsoft.com/en-us/windows-hardware/drivers/install/format-of-log-entries-that-are-not-part-of-a-text-log-section
   # pylint: enable=line-too-long
-  _ENTRY_PREFIX = pyparsing.oneOf(['.', '!!!', '!'])
 
   # Cannot rely on the documentation since undocumented event catagegories
   # have been observed, like: "cmd:", "idb:" and "pol:".
-  _EVENT_CATEGORY = (
-      pyparsing.Word(pyparsing.alphas + '.', min=2, max=3) +
-      pyparsing.Literal(':'))
+  _SECTION_BODY_OR_NON_SECTION_PATTERN = (
+      r'[ \t]*(?:(?:!!!|!|\.)[ \t]*)?[A-Za-z.]{2,3}[ \t]*:')
+
+  _SECTION_BODY_OR_NON_SECTION_RE = re.compile(
+      _SECTION_BODY_OR_NON_SECTION_PATTERN)
 
-  _SECTION_BODY_OR_NON_SECTION_LINE = (
-      pyparsing.Optional(_ENTRY_PREFIX) + _EVENT_CATEGORY +
-      pyparsing.restOfLine() + _END_OF_LINE)
+  # Consecutive section body lines, that end with a line feed, are matched at
+  # once since they are ignored.
+  _SECTION_BODY_OR_NON_SECTION_LINES_RE = re.compile(
+      r'(?:' + _SECTION_BODY_OR_NON_SECTION_PATTERN + r'[^\n]*\n)+')
 
   # Undocumented observed lines.
-  _BOOT_SESSION_LINE = (
-      pyparsing.Literal('[Boot Session:') +
-      _DATE_TIME +
-      pyparsing.Literal(']') +
-      _END_OF_LINE)
-
-  _LINE_STRUCTURES = [
-      ('ignorable_line', _BOOT_SESSION_LINE),
-      ('ignorable_line', _LOG_HEADER_END_LINE),
-      ('ignorable_line', _LOG_HEADER_START_LINE),
-      ('ignorable_line', _LOG_HEADER_BODY_LINE),
-      ('ignorable_line', _SECTION_BODY_OR_NON_SECTION_LINE),
-      ('section_end', _SECTION_END_LINE),
-      ('section_end_exit_status', _SECTION_END_EXIT_STATUS_LINE),
-      ('section_header', _SECTION_HEADER_LINE),
-      ('section_start', _SECTION_HEADER_START_LINE)]
+  _BOOT_SESSION_RE = re.compile(
+      r'\[Boot Session:[ \t]*' + _DATE_TIME_PATTERN + r'\][ \t]*$')
+
+  # Line structures per line prefix, where every regular expression is
+  # matched from the start of the line. Lines with another prefix, such as
+  # section body lines, use _DEFAULT_LINE_STRUCTURES.
+  _LINE_STRUCTURES_PER_PREFIX = {
+      '<<<': [
+          ('section_end', _SECTION_END_RE),
+          ('section_end_exit_status', _SECTION_END_EXIT_STATUS_RE)],
+      '>>>': [
+          ('section_header', _SECTION_HEADER_RE),
+          ('section_start', _SECTION_HEADER_START_RE)],
+      '[Be': [
+          ('ignorable_line', _LOG_HEADER_END_RE)],
+      '[Bo': [
+          ('ignorable_line', _BOOT_SESSION_RE)],
+      '[De': [
+          ('ignorable_line', _LOG_HEADER_START_RE)]}
+
+  _DEFAULT_LINE_STRUCTURES = [
+      ('ignorable_line', _SECTION_BODY_OR_NON_SECTION_RE),
+      ('ignorable_line', _LOG_HEADER_BODY_RE)]
 
   VERIFICATION_GRAMMAR = _LOG_HEADER_START_LINE
 
@@ -147,6 +139,11 @@ class SetupAPILogTextPlugin(interface.TextPlugin):
     """Initializes a text parser plugin."""
     super(SetupAPILogTextPlugin, self).__init__()
     self._event_data = None
+    self._record_handlers = {
+        'section_end': self._ParseSectionEnd,
+        'section_end_exit_status': self._ParseSectionEndExitStatus,
+        'section_header': self._ParseSectionHeader,
+        'section_start': self._ParseSectionStart}
 
   def _ParseRecord(self, parser_mediator, key, structure):
     """Parses a pyparsing structure.
@@ -155,7 +152,7 @@ class SetupAPILogTextPlugin(interface.TextPlugin):
       parser_mediator (ParserMediator): mediates interactions between parsers
           and other components, such as storage and dfVFS.
       key (str): name of the parsed structure.
-      structure (pyparsing.ParseResults): tokens from a parsed log line.
+      structure (re.Match): parsed log line.
 
     Raises:
       ParseError: if the structure cannot be parsed.
@@ -163,39 +160,139 @@ class SetupAPILogTextPlugin(interface.TextPlugin):
     if key == 'ignorable_line':
       return
 
-    if key == 'section_header':
-      self._event_data = SetupAPILogEventData()
-      self._event_data.entry_type = self._GetValueFromStructure(
-          structure, 'entry_type')
+    record_handler = self._record_handlers.get(key, None)
+    if record_handler:
+      record_handler(parser_mediator, structure)
+
+  # pylint: disable=unused-argument
+
+  def _ParseSectionEnd(self, parser_mediator, structure):
+    """Parses a section end.
+
+    Args:
+      parser_mediator (ParserMediator): mediates interactions between parsers
+          and other components, such as storage and dfVFS.
+      structure (re.Match): parsed log line.
+
+    Raises:
+      ParseError: if the structure cannot be parsed.
+    """
+    # A section that already has an end time indicates a missing section
+    # header. The state is reset so that values are not stored in the event
+    # data of another section.
+    if self._event_data is None or self._event_data.end_time is not None:
+      self._ResetState()
+      raise errors.ParseError('Missing section header.')
+
+    self._event_data.end_time = self._ParseTimeElements(structure.group(1))
+
+  def _ParseSectionEndExitStatus(self, parser_mediator, structure):
+    """Parses a section end exit status.
+
+    Args:
+      parser_mediator (ParserMediator): mediates interactions between parsers
+          and other components, such as storage and dfVFS.
+      structure (re.Match): parsed log line.
+
+    Raises:
+      ParseError: if the structure cannot be parsed.
+    """
+    if self._event_data is None:
+      raise errors.ParseError('Missing section header.')
+
+    self._event_data.exit_status = structure.group(1)
 
-    elif key == 'section_start':
-      time_elements_structure = self._GetValueFromStructure(
-          structure, 'start_time')
+    parser_mediator.ProduceEventData(self._event_data)
 
-      self._event_data.start_time = self._ParseTimeElements(
-          time_elements_structure)
+    self._ResetState()
 
-    elif key == 'section_end':
-      time_elements_structure = self._GetValueFromStructure(
-          structure, 'end_time')
+  def _ParseSectionHeader(self, parser_mediator, structure):
+    """Parses a section header.
 
-      self._event_data.end_time = self._ParseTimeElements(
-          time_elements_structure)
+    Args:
+      parser_mediator (ParserMediator): mediates interactions between parsers
+          and other components, such as storage and dfVFS.
+      structure (re.Match): parsed log line.
+    """
+    # The event data of a previous section without an exit status is
+    # discarded.
+    self._event_data = SetupAPILogEventData()
+    self._event_data.entry_type = structure.group(1)
 
-    elif key == 'section_end_exit_status':
-      self._event_data.exit_status = self._GetValueFromStructure(
-          structure, 'exit_status')
+  def _ParseSectionStart(self, parser_mediator, structure):
+    """Parses a section start.
 
-      parser_mediator.ProduceEventData(self._event_data)
+    Args:
+      parser_mediator (ParserMediator): mediates interactions between parsers
+          and other components, such as storage and dfVFS.
+      structure (re.Match): parsed log line.
 
+    Raises:
+      ParseError: if the structure cannot be parsed.
+    """
+    # A section that already has a start time indicates a missing section
+    # header. The state is reset so that values are not stored in the event
+    # data of another section.
+    if self._event_data is None or self._event_data.start_time is not None:
       self._ResetState()
+      raise errors.ParseError('Missing section header.')
+
+    self._event_data.start_time = self._ParseTimeElements(structure.group(1))
+
+  # pylint: enable=unused-argument
 
-  def _ParseTimeElements(self, time_elements_structure):
+  def _ParseString(self, string):
+    """Parses the first line or section body lines of a string.
+
+    Regular expressions are used instead of pyparsing since the line format is
+    simple and pyparsing tries every line structure on every line. Only the
+    line structures of the line prefix are tried, except for consecutive
+    section body lines which are parsed as one ignorable line.
+
+    Args:
+      string (str): string.
+
+    Returns:
+      tuple[str, re.Match, int, int]: key, matched line, start and end offset.
+
+    Raises:
+      ParseError: when the string cannot be parsed by the grammar.
+    """
+    # Most lines of a SetupAPI log are section body lines, hence consecutive
+    # section body lines are skipped with a single match.
+    match = self._SECTION_BODY_OR_NON_SECTION_LINES_RE.match(string)
+    if match:
+      return 'ignorable_line', match, 0, match.end()
+
+    end = string.find('\n')
+    if end == -1:
+      line = string
+      end = len(string)
+    else:
+      line = string[:end]
+      end += 1
+
+    line_structures = self._LINE_STRUCTURES_PER_PREFIX.get(
+        line[:3], self._DEFAULT_LINE_STRUCTURES)
+
+    for key, regular_expression in line_structures:
+      match = regular_expression.match(line)
+      if match:
+        return key, match, 0, end
+
+    raise errors.ParseError('No match found.')
+
+  # Note that the date and time values are cached, since consecutive sections
+  # often share the same date and time. The cached date and time values are
+  # shared between event data and should not be changed.
+  @staticmethod
+  @functools.lru_cache(maxsize=128)
+  def _ParseTimeElements(time_elements_string):
     """Parses date and time elements of a log line.
 
     Args:
-      time_elements_structure (pyparsing.ParseResults): date and time elements
-          of a log line.
+      time_elements_string (str): date and time elements of a log line,
+          formatted as: "YYYY/MM/DD hh:mm:ss.###".
 
     Returns:
       dfdatetime.TimeElements: date and time value.
@@ -204,18 +301,19 @@ class SetupAPILogTextPlugin(interface.TextPlugin):
       ParseError: if a valid date and time value cannot be derived from
           the time elements.
     """
-    try:
-      (year, month, day_of_month, hours, minutes, seconds, milliseconds) = (
-          time_elements_structure)
-
-      # Ensure time_elements_tuple is not a pyparsing.ParseResults otherwise
-      # copy.deepcopy() of the dfDateTime object will fail on Python 3.8 with:
-      # "TypeError: 'str' object is not callable" due to pyparsing.ParseResults
-      # overriding __getattr__ with a function that returns an empty string
-      # when named token does not exist.
-      time_elements_tuple = (
-          year, month, day_of_month, hours, minutes, seconds, milliseconds)
+    # The date and time elements have a fixed width, except for the
+    # whitespace between the date and the time, hence the time elements are
+    # sliced relative to the end of the string.
+    time_elements_tuple = (
+        int(time_elements_string[0:4], 10),
+        int(time_elements_string[5:7], 10),
+        int(time_elements_string[8:10], 10),
+        int(time_elements_string[-12:-10], 10),
+        int(time_elements_string[-9:-7], 10),
+        int(time_elements_string[-6:-4], 10),
+        int(time_elements_string[-3:], 10))
 
+    try:
       date_time = dfdatetime_time_elements.TimeElementsInMilliseconds(
           time_elements_tuple=time_elements_tuple)
 
@@ -224,7 +322,7 @@ class SetupAPILogTextPlugin(interface.TextPlugin):
 
       return date_time
 
-    except (TypeError, ValueError) as exception:
+    except ValueError as exception:
       raise errors.ParseError(
           'Unable to parse time elements with error: {0!s}'.format(exception))
 
@@ -243,6 +341,11 @@ class SetupAPILogTextPlugin(interface.TextPlugin):
     Returns:
       bool: True if this is the correct parser, False otherwise.
     """
+    # Format verification will be faster on average by checking the fixed-text
+    # start of the log header first.
+    if not text_reader.lines.startswith('[Device Install Log]'):
+      return False
+
     try:
       _, start, _ = self._VerifyString(text_reader.lines)
     except errors.ParseError:
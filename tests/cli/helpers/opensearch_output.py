@@ -21,6 +21,9 @@ class OpenSearchOutputArgumentsHelperTest(
 
   _EXPECTED_OUTPUT = """\
 usage: cli_helper.py [--index_name NAME] [--flush_interval INTERVAL]
+                     [--opensearch-bulk-chunk-size SIZE]
+                     [--opensearch-bulk-thread-count NUMBER]
+                     [--opensearch-bulk-queue-size SIZE]
                      [--opensearch-server HOSTNAME] [--opensearch-port PORT]
                      [--opensearch-user USERNAME]
                      [--opensearch-password PASSWORD]
@@ -38,6 +41,15 @@ Test argument parser.
                         Events to queue up before bulk insert to OpenSearch.
   --index_name NAME, --index-name NAME
                         Name of the index in OpenSearch.
+  --opensearch-bulk-chunk-size SIZE, --opensearch_bulk_chunk_size SIZE
+                        Maximum number of events per bulk insert request to
+                        OpenSearch.
+  --opensearch-bulk-queue-size SIZE, --opensearch_bulk_queue_size SIZE
+                        Maximum number of bulk insert requests to OpenSearch
+                        pending to be handled by the threads.
+  --opensearch-bulk-thread-count NUMBER, --opensearch_bulk_thread_count NUMBER
+                        Number of threads used for bulk insert requests to
+                        OpenSearch.
   --opensearch-mappings PATH, --opensearch_mappings PATH
                         Path to a file containing mappings for OpenSearch
                         indexing.
@@ -76,14 +88,28 @@ Test argument parser.
     options = cli_test_lib.TestOptions()
     options._data_location = 'data'
 
+    options.opensearch_bulk_chunk_size = 250
+    options.opensearch_bulk_queue_size = 8
+    options.opensearch_bulk_thread_count = 2
+
     output_module = opensearch.OpenSearchOutputModule()
     opensearch_output.OpenSearchOutputArgumentsHelper.ParseOptions(
         options, output_module)
 
+    self.assertEqual(output_module._chunk_size, 250)
+    self.assertEqual(output_module._queue_size, 8)
+    self.assertEqual(output_module._thread_count, 2)
+
     with self.assertRaises(errors.BadConfigObject):
       opensearch_output.OpenSearchOutputArgumentsHelper.ParseOptions(
           options, None)
 
+    options.opensearch_bulk_thread_count = 0
+
+    with self.assertRaises(errors.BadConfigOption):
+      opensearch_output.OpenSearchOutputArgumentsHelper.ParseOptions(
+          options, output_module)
+
 
 if __name__ == '__main__':
   unittest.main()
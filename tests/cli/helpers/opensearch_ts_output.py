@@ -22,6 +22,9 @@ class OpenSearchTimesketchOutputArgumentsHelperTest(
 
   _EXPECTED_OUTPUT = """\
 usage: cli_helper.py [--index_name NAME] [--flush_interval INTERVAL]
+                     [--opensearch-bulk-chunk-size SIZE]
+                     [--opensearch-bulk-thread-count NUMBER]
+                     [--opensearch-bulk-queue-size SIZE]
                      [--opensearch-server HOSTNAME] [--opensearch-port PORT]
                      [--opensearch-user USERNAME]
                      [--opensearch-password PASSWORD]
@@ -40,6 +43,15 @@ Test argument parser.
                         Events to queue up before bulk insert to OpenSearch.
   --index_name NAME, --index-name NAME
                         Name of the index in OpenSearch.
+  --opensearch-bulk-chunk-size SIZE, --opensearch_bulk_chunk_size SIZE
+                        Maximum number of events per bulk insert request to
+                        OpenSearch.
+  --opensearch-bulk-queue-size SIZE, --opensearch_bulk_queue_size SIZE
+                        Maximum number of bulk insert requests to OpenSearch
+                        pending to be handled by the threads.
+  --opensearch-bulk-thread-count NUMBER, --opensearch_bulk_thread_count NUMBER
+                        Number of threads used for bulk insert requests to
+                        OpenSearch.
   --opensearch-mappings PATH, --opensearch_mappings PATH
                         Path to a file containing mappings for OpenSearch
                         indexing.
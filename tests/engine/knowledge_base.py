@@ -255,6 +255,30 @@ class KnowledgeBaseTest(shared_test_lib.BaseTestCase):
     value = knowledge_base_object.GetValue('Bogus')
     self.assertIsNone(value)
 
+  def testGetWindowsEventLogProvidersPerPath(self):
+    """Tests the GetWindowsEventLogProvidersPerPath function."""
+    knowledge_base_object = knowledge_base.KnowledgeBase()
+
+    environment_variable = artifacts.EnvironmentVariableArtifact(
+        case_sensitive=False, name='SystemRoot', value='C:\\Windows')
+    knowledge_base_object.AddEnvironmentVariable(environment_variable)
+
+    windows_eventlog_provider = artifacts.WindowsEventLogProviderArtifact(
+        event_message_files=[
+            '%SystemRoot%\\System32\\WerFault.exe', 'wevtapi.dll'],
+        log_source='Application Error')
+    knowledge_base_object._windows_eventlog_providers['Application Error'] = (
+        windows_eventlog_provider)
+
+    providers_per_path = (
+        knowledge_base_object.GetWindowsEventLogProvidersPerPath())
+    self.assertEqual(providers_per_path, {
+        '\\windows\\system32': {
+            'werfault.exe': 'werfault.exe',
+            'werfault.exe.mui': 'werfault.exe',
+            'wevtapi.dll': 'wevtapi.dll',
+            'wevtapi.dll.mui': 'wevtapi.dll'}})
+
   def testHasUserAccounts(self):
     """Tests the HasUserAccounts function."""
     knowledge_base_object = knowledge_base.KnowledgeBase()
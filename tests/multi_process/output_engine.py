@@ -351,6 +351,32 @@ class OutputAndFormattingMultiProcessEngineTest(
     self.assertEqual(len(output_module.events), 15)
     self.assertEqual(len(output_module.macb_groups), 3)
 
+  def testInternalExportEventsWithoutWritingEvents(self):
+    """Tests the _ExportEvents function with an output module without events."""
+    knowledge_base_object = knowledge_base.KnowledgeBase()
+
+    output_module = TestOutputModule()
+    output_module.WRITES_EVENTS = False
+
+    test_engine = output_engine.OutputAndFormattingMultiProcessEngine()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, 'storage.plaso')
+      self._CreateTestStorageFile(temp_file)
+      self._ReadSessionConfiguration(temp_file, knowledge_base_object)
+
+      storage_reader = (
+          storage_factory.StorageFactory.CreateStorageReaderForFile(temp_file))
+
+      test_engine._ExportEvents(storage_reader, output_module)
+
+    self.assertEqual(len(output_module.events), 0)
+    self.assertEqual(len(output_module.macb_groups), 0)
+    self.assertEqual(
+        test_engine._events_status.number_of_duplicate_events, 2)
+    self.assertEqual(
+        test_engine._events_status.number_of_macb_grouped_events, 11)
+
   # TODO: add test for _FlushExportBuffer.
 
   def testExportEvents(self):
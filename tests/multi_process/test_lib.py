@@ -51,7 +51,7 @@ class MultiProcessingTestCase(shared_test_lib.BaseTestCase):
       parser_mediator.SetFileEntry(file_entry)
 
     if parser_chain:
-      parser_mediator.parser_chain = parser_chain
+      parser_mediator.AppendToParserChain(parser_chain)
 
     return parser_mediator
 
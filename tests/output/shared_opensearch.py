@@ -23,6 +23,60 @@ class TestOpenSearchOutputModule(
   def _Connect(self):
     """Connects to an OpenSearch server."""
     self._client = MagicMock()
+    self._client.bulk.return_value = {'errors': False, 'items': []}
+    self._client.transport.serializer = (
+        shared_opensearch.opensearchpy.JSONSerializer())
+
+
+@unittest.skipIf(
+    shared_opensearch.MsgspecJSONSerializer is None,
+    'missing opensearch-py or msgspec')
+class MsgspecJSONSerializerTest(test_lib.OutputModuleTestCase):
+  """Tests the OpenSearch JSON serializer that uses msgspec."""
+
+  def testDumps(self):
+    """Tests the dumps function."""
+    serializer = shared_opensearch.MsgspecJSONSerializer()
+
+    serialized_data = serializer.dumps({'_index': 'test', 'value': 'é'})
+    self.assertEqual(serialized_data, '{"_index":"test","value":"é"}')
+
+    serialized_data = serializer.dumps('{"value":1}')
+    self.assertEqual(serialized_data, '{"value":1}')
+
+    with self.assertRaises(
+        shared_opensearch.opensearchpy.exceptions.SerializationError):
+      serializer.dumps({'value': object()})
+
+  def testDumpsDifferencesWithJSONSerializer(self):
+    """Tests the dumps function on data json serializes differently."""
+    serializer = shared_opensearch.MsgspecJSONSerializer()
+    json_serializer = shared_opensearch.opensearchpy.JSONSerializer()
+
+    # NaN and infinity are encoded as null instead of invalid JSON tokens.
+    serialized_data = serializer.dumps({'value': float('nan')})
+    self.assertEqual(serialized_data, '{"value":null}')
+
+    serialized_data = json_serializer.dumps({'value': float('nan')})
+    self.assertEqual(serialized_data, '{"value":NaN}')
+
+    serialized_data = serializer.dumps({'value': float('inf')})
+    self.assertEqual(serialized_data, '{"value":null}')
+
+    # Dictionaries with numeric keys are encoded the same as json.
+    test_data = {1: 'integer', 1.5: 'float'}
+    serialized_data = serializer.dumps(test_data)
+    self.assertEqual(serialized_data, '{"1":"integer","1.5":"float"}')
+    self.assertEqual(serialized_data, json_serializer.dumps(test_data))
+
+    # Dictionaries with boolean or None keys are serialized by json.
+    test_data = {None: 'none', True: 'boolean'}
+    serialized_data = serializer.dumps(test_data)
+    self.assertEqual(serialized_data, '{"null":"none","true":"boolean"}')
+
+    with self.assertRaises(
+        shared_opensearch.opensearchpy.exceptions.SerializationError):
+      serializer.dumps({(1, 2): 'tuple'})
 
 
 @unittest.skipIf(
@@ -82,7 +136,7 @@ class SharedOpenSearchOutputModuleTest(test_lib.OutputModuleTestCase):
     output_module._InsertEvent(
         output_mediator, event, event_data, event_data_stream, None)
 
-    self.assertEqual(len(output_module._event_documents), 2)
+    self.assertEqual(len(output_module._event_documents), 1)
     self.assertEqual(output_module._number_of_buffered_events, 1)
 
     output_module._FlushEvents()
@@ -90,6 +144,28 @@ class SharedOpenSearchOutputModuleTest(test_lib.OutputModuleTestCase):
     self.assertEqual(len(output_module._event_documents), 0)
     self.assertEqual(output_module._number_of_buffered_events, 0)
 
+    output_module._client.bulk.assert_called_once()
+
+  def testFlushEventsWithMultipleThreads(self):
+    """Tests the _FlushEvents function with multiple threads."""
+    output_module = TestOpenSearchOutputModule()
+    output_module.SetBulkInsertOptions(500, 4, 4)
+
+    output_module._Connect()
+
+    output_module._event_documents = [
+        {'_index': 'test', '_source': {'value': index}}
+        for index in range(8)]
+    output_module._number_of_buffered_events = 8
+
+    output_module._FlushEvents()
+
+    self.assertEqual(len(output_module._event_documents), 0)
+    self.assertEqual(output_module._number_of_buffered_events, 0)
+
+    # The chunk size is reduced so that every thread handles a chunk.
+    self.assertEqual(output_module._client.bulk.call_count, 4)
+
   def testGetSanitizedEventValues(self):
     """Tests the _GetSanitizedEventValues function."""
     output_mediator = self._CreateOutputMediator()
@@ -156,13 +232,13 @@ class SharedOpenSearchOutputModuleTest(test_lib.OutputModuleTestCase):
     output_module._InsertEvent(
         output_mediator, event, event_data, event_data_stream, None)
 
-    self.assertEqual(len(output_module._event_documents), 2)
+    self.assertEqual(len(output_module._event_documents), 1)
     self.assertEqual(output_module._number_of_buffered_events, 1)
 
     output_module._InsertEvent(
         output_mediator, event, event_data, event_data_stream, None)
 
-    self.assertEqual(len(output_module._event_documents), 4)
+    self.assertEqual(len(output_module._event_documents), 2)
     self.assertEqual(output_module._number_of_buffered_events, 2)
 
     output_module._FlushEvents()
@@ -182,6 +258,23 @@ class SharedOpenSearchOutputModuleTest(test_lib.OutputModuleTestCase):
 
     self.assertIsNone(output_module._client)
 
+  def testSetBulkInsertOptions(self):
+    """Tests the SetBulkInsertOptions function."""
+    output_module = TestOpenSearchOutputModule()
+
+    self.assertEqual(
+        output_module._chunk_size, output_module._DEFAULT_CHUNK_SIZE)
+    self.assertEqual(
+        output_module._thread_count, output_module._DEFAULT_THREAD_COUNT)
+    self.assertEqual(
+        output_module._queue_size, output_module._DEFAULT_QUEUE_SIZE)
+
+    output_module.SetBulkInsertOptions(100, 2, 8)
+
+    self.assertEqual(output_module._chunk_size, 100)
+    self.assertEqual(output_module._thread_count, 2)
+    self.assertEqual(output_module._queue_size, 8)
+
   def testSetFlushInterval(self):
     """Tests the SetFlushInterval function."""
     output_module = TestOpenSearchOutputModule()
@@ -256,7 +349,7 @@ class SharedOpenSearchOutputModuleTest(test_lib.OutputModuleTestCase):
     output_module.WriteEventBody(
         output_mediator, event, event_data, event_data_stream, None)
 
-    self.assertEqual(len(output_module._event_documents), 2)
+    self.assertEqual(len(output_module._event_documents), 1)
     self.assertEqual(output_module._number_of_buffered_events, 1)
 
 
@@ -2,17 +2,27 @@
 # -*- coding: utf-8 -*-
 """Tests for the parsers mediator."""
 
+import datetime
+import os
+import sys
 import unittest
 
+import pytz
+
+from dfvfs.helpers import fake_file_system_builder
 from dfvfs.lib import definitions as dfvfs_definitions
 from dfvfs.path import factory as path_spec_factory
 from dfvfs.resolver import resolver as path_spec_resolver
 
+from plaso.containers import event_sources
 from plaso.containers import events
+from plaso.engine import configurations
 from plaso.engine import knowledge_base
+from plaso.engine import process_info
 from plaso.parsers import mediator
 from plaso.storage.fake import writer as fake_writer
 
+from tests import test_lib as shared_test_lib
 from tests.parsers import test_lib
 
 
@@ -21,8 +31,51 @@ class ParsersMediatorTest(test_lib.ParserTestCase):
 
   # pylint: disable=protected-access
 
-  # TODO: add tests for AppendToParserChain.
-  # TODO: add tests for ClearParserChain.
+  def testAppendToParserChain(self):
+    """Tests the AppendToParserChain function."""
+    knowledge_base_object = knowledge_base.KnowledgeBase()
+    parser_mediator = mediator.ParserMediator(knowledge_base_object)
+
+    parser_chain = parser_mediator.GetParserChain()
+    self.assertEqual(parser_chain, '')
+
+    parser_mediator.AppendToParserChain('sqlite')
+    parser_chain = parser_mediator.GetParserChain()
+    self.assertEqual(parser_chain, 'sqlite')
+
+    parser_mediator.AppendToParserChain('chrome_27_history')
+    parser_chain = parser_mediator.GetParserChain()
+    self.assertEqual(parser_chain, 'sqlite/chrome_27_history')
+    self.assertIs(parser_chain, sys.intern('sqlite/chrome_27_history'))
+
+  def testClearParserChain(self):
+    """Tests the ClearParserChain function."""
+    knowledge_base_object = knowledge_base.KnowledgeBase()
+    parser_mediator = mediator.ParserMediator(knowledge_base_object)
+
+    parser_mediator.AppendToParserChain('sqlite')
+    parser_mediator.AppendToParserChain('chrome_27_history')
+
+    parser_mediator.ClearParserChain()
+    parser_chain = parser_mediator.GetParserChain()
+    self.assertEqual(parser_chain, '')
+
+  def testGetCurrentYear(self):
+    """Tests the GetCurrentYear function."""
+    knowledge_base_object = knowledge_base.KnowledgeBase()
+    parser_mediator = mediator.ParserMediator(knowledge_base_object)
+
+    current_year = parser_mediator.GetCurrentYear()
+    self.assertEqual(current_year, datetime.datetime.now().year)
+
+    parser_mediator._current_year = 2000
+    current_year = parser_mediator.GetCurrentYear()
+    self.assertEqual(current_year, 2000)
+
+    parser_mediator._current_year_timestamp -= (
+        parser_mediator._CURRENT_YEAR_REFRESH_INTERVAL + 1)
+    current_year = parser_mediator.GetCurrentYear()
+    self.assertEqual(current_year, datetime.datetime.now().year)
 
   def testGetDisplayName(self):
     """Tests the GetDisplayName function."""
@@ -125,9 +178,86 @@ class ParsersMediatorTest(test_lib.ParserTestCase):
     filename = parser_mediator.GetFilename()
     self.assertIsNone(filename)
 
-  # TODO: add tests for GetParserChain.
+    file_system_builder = fake_file_system_builder.FakeFileSystemBuilder()
+    file_system_builder.AddFile('/Windows/System32/wevtapi.dll', b'')
+
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_FAKE,
+        location='/Windows/System32/wevtapi.dll')
+    file_entry = file_system_builder.file_system.GetFileEntryByPathSpec(
+        path_spec)
+    parser_mediator.SetFileEntry(file_entry)
+
+    filename = parser_mediator.GetFilename()
+    self.assertEqual(filename, 'wevtapi.dll')
+
+    parser_mediator.ResetFileEntry()
+
+    filename = parser_mediator.GetFilename()
+    self.assertIsNone(filename)
+
   # TODO: add tests for GetRelativePathForPathSpec.
-  # TODO: add tests for PopFromParserChain.
+
+  def testGetWindowsEventLogMessageFile(self):
+    """Tests the GetWindowsEventLogMessageFile function."""
+    file_system_builder = fake_file_system_builder.FakeFileSystemBuilder()
+    file_system_builder.AddFile('/Windows/System32/wevtapi.dll', b'')
+    file_system_builder.AddFile('/Windows/System32/en-US/wevtapi.dll.mui', b'')
+    file_system_builder.AddFile('/Windows/System32/bogus.dll', b'')
+
+    knowledge_base_object = knowledge_base.KnowledgeBase()
+    knowledge_base_object._windows_eventlog_providers_per_path = {
+        '/windows/system32': {
+            'wevtapi.dll': 'wevtapi.dll',
+            'wevtapi.dll.mui': 'wevtapi.dll'}}
+
+    parser_mediator = mediator.ParserMediator(knowledge_base_object)
+
+    message_file = parser_mediator.GetWindowsEventLogMessageFile()
+    self.assertIsNone(message_file)
+
+    for location in (
+        '/Windows/System32/wevtapi.dll',
+        '/Windows/System32/en-US/wevtapi.dll.mui'):
+      path_spec = path_spec_factory.Factory.NewPathSpec(
+          dfvfs_definitions.TYPE_INDICATOR_FAKE, location=location)
+      file_entry = file_system_builder.file_system.GetFileEntryByPathSpec(
+          path_spec)
+      parser_mediator.SetFileEntry(file_entry)
+
+      message_file = parser_mediator.GetWindowsEventLogMessageFile()
+      self.assertIsNotNone(message_file)
+      self.assertEqual(message_file.path, location)
+      self.assertEqual(
+          message_file.windows_path, '/windows/system32\\wevtapi.dll')
+
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_FAKE,
+        location='/Windows/System32/bogus.dll')
+    file_entry = file_system_builder.file_system.GetFileEntryByPathSpec(
+        path_spec)
+    parser_mediator.SetFileEntry(file_entry)
+
+    message_file = parser_mediator.GetWindowsEventLogMessageFile()
+    self.assertIsNone(message_file)
+
+  def testPopFromParserChain(self):
+    """Tests the PopFromParserChain function."""
+    knowledge_base_object = knowledge_base.KnowledgeBase()
+    parser_mediator = mediator.ParserMediator(knowledge_base_object)
+
+    parser_mediator.AppendToParserChain('sqlite')
+    parser_mediator.AppendToParserChain('chrome_27_history')
+
+    parser_mediator.PopFromParserChain()
+    parser_chain = parser_mediator.GetParserChain()
+    self.assertEqual(parser_chain, 'sqlite')
+
+    parser_mediator.PopFromParserChain()
+    parser_chain = parser_mediator.GetParserChain()
+    self.assertEqual(parser_chain, '')
+
+    self.assertNotEqual(parser_mediator.last_activity_timestamp, 0.0)
 
   def testProduceEventData(self):
     """Tests the ProduceEventData method."""
@@ -142,14 +272,22 @@ class ParsersMediatorTest(test_lib.ParserTestCase):
     event_data_stream = events.EventDataStream()
     parser_mediator.ProduceEventDataStream(event_data_stream)
 
+    parser_mediator.AppendToParserChain('test')
+
     event_data = events.EventData()
     event_data.parser = 'test_parser'
 
     parser_mediator.ProduceEventData(event_data)
+    self.assertEqual(event_data.parser, 'test_parser')
+
+    event_data = events.EventData()
+
+    parser_mediator.ProduceEventData(event_data)
+    self.assertEqual(event_data.parser, 'test')
 
     number_of_event_data = storage_writer.GetNumberOfAttributeContainers(
         'event_data')
-    self.assertEqual(number_of_event_data, 1)
+    self.assertEqual(number_of_event_data, 2)
 
     number_of_warnings = storage_writer.GetNumberOfAttributeContainers(
         'extraction_warning')
@@ -160,7 +298,57 @@ class ParsersMediatorTest(test_lib.ParserTestCase):
     self.assertEqual(number_of_warnings, 0)
 
   # TODO: add tests for ProduceEventDataStream.
-  # TODO: add tests for ProduceEventSource.
+
+  def testProduceEventDataWithLastActivityTimestamp(self):
+    """Tests that ProduceEventData updates the last activity timestamp."""
+    knowledge_base_object = knowledge_base.KnowledgeBase()
+    parser_mediator = mediator.ParserMediator(knowledge_base_object)
+
+    storage_writer = fake_writer.FakeStorageWriter()
+    parser_mediator.SetStorageWriter(storage_writer)
+
+    storage_writer.Open()
+
+    self.assertEqual(parser_mediator.last_activity_timestamp, 0.0)
+
+    parser_mediator.ProduceEventData(events.EventData())
+
+    last_activity_timestamp = parser_mediator.last_activity_timestamp
+    self.assertNotEqual(last_activity_timestamp, 0.0)
+
+    # The timestamp is not updated within the update interval.
+    parser_mediator.ProduceEventData(events.EventData())
+    self.assertEqual(
+        parser_mediator.last_activity_timestamp, last_activity_timestamp)
+
+    parser_mediator._last_activity_monotonic_timestamp -= (
+        parser_mediator._LAST_ACTIVITY_TIMESTAMP_UPDATE_INTERVAL)
+    parser_mediator.last_activity_timestamp = 0.0
+
+    parser_mediator.ProduceEventData(events.EventData())
+    self.assertNotEqual(parser_mediator.last_activity_timestamp, 0.0)
+
+  def testProduceEventSource(self):
+    """Tests the ProduceEventSource method."""
+    knowledge_base_object = knowledge_base.KnowledgeBase()
+    parser_mediator = mediator.ParserMediator(knowledge_base_object)
+
+    storage_writer = fake_writer.FakeStorageWriter()
+    parser_mediator.SetStorageWriter(storage_writer)
+
+    storage_writer.Open()
+
+    event_source = event_sources.FileEntryEventSource()
+    parser_mediator.ProduceEventSource(event_source)
+
+    # The single process extraction engine reads back the event source
+    # directly after it has been produced.
+    written_event_source = storage_writer.GetFirstWrittenEventSource()
+    self.assertIsNotNone(written_event_source)
+
+    number_of_event_sources = storage_writer.GetNumberOfAttributeContainers(
+        'event_source')
+    self.assertEqual(number_of_event_sources, 1)
 
   def testProduceExtractionWarning(self):
     """Tests the ProduceExtractionWarning method."""
@@ -222,6 +410,76 @@ class ParsersMediatorTest(test_lib.ParserTestCase):
 
     parser_mediator.SetFileEntry(None)
 
+  def testSetPreferredCodepage(self):
+    """Tests the SetPreferredCodepage function."""
+    knowledge_base_object = knowledge_base.KnowledgeBase()
+    knowledge_base_object.SetCodepage('CP1252')
+
+    parser_mediator = mediator.ParserMediator(knowledge_base_object)
+    self.assertEqual(parser_mediator.codepage, 'cp1252')
+
+    parser_mediator.SetPreferredCodepage('utf-8')
+    self.assertEqual(parser_mediator.codepage, 'utf-8')
+
+    parser_mediator.SetPreferredCodepage(None)
+    self.assertEqual(parser_mediator.codepage, 'cp1252')
+
+  def testSetPreferredLanguage(self):
+    """Tests the SetPreferredLanguage function."""
+    knowledge_base_object = knowledge_base.KnowledgeBase()
+    parser_mediator = mediator.ParserMediator(knowledge_base_object)
+
+    mediator.ParserMediator._GetLCIDForLanguageTag.cache_clear()
+
+    parser_mediator.SetPreferredLanguage('is-IS')
+    self.assertEqual(parser_mediator._language_tag, 'is-IS')
+    self.assertEqual(parser_mediator._lcid, 0x040f)
+
+    cache_info = mediator.ParserMediator._GetLCIDForLanguageTag.cache_info()
+    self.assertEqual(cache_info.hits, 0)
+    self.assertEqual(cache_info.misses, 1)
+
+    parser_mediator.SetPreferredLanguage('is-IS')
+    self.assertEqual(parser_mediator._lcid, 0x040f)
+
+    cache_info = mediator.ParserMediator._GetLCIDForLanguageTag.cache_info()
+    self.assertEqual(cache_info.hits, 1)
+    self.assertEqual(cache_info.misses, 1)
+
+    parser_mediator.SetPreferredLanguage(None)
+    self.assertEqual(parser_mediator.language, 'en-us')
+
+    with self.assertRaises(ValueError):
+      parser_mediator.SetPreferredLanguage('bogus')
+
+  def testSetPreferredTimeZone(self):
+    """Tests the SetPreferredTimeZone function."""
+    knowledge_base_object = knowledge_base.KnowledgeBase()
+    parser_mediator = mediator.ParserMediator(knowledge_base_object)
+
+    mediator.ParserMediator._GetTimeZone.cache_clear()
+
+    parser_mediator.SetPreferredTimeZone('Europe/Amsterdam')
+    time_zone = parser_mediator.timezone
+    self.assertEqual(time_zone.zone, 'Europe/Amsterdam')
+
+    cache_info = mediator.ParserMediator._GetTimeZone.cache_info()
+    self.assertEqual(cache_info.hits, 0)
+    self.assertEqual(cache_info.misses, 1)
+
+    parser_mediator.SetPreferredTimeZone('Europe/Amsterdam')
+    self.assertIs(parser_mediator.timezone, time_zone)
+
+    cache_info = mediator.ParserMediator._GetTimeZone.cache_info()
+    self.assertEqual(cache_info.hits, 1)
+    self.assertEqual(cache_info.misses, 1)
+
+    parser_mediator.SetPreferredTimeZone(None)
+    self.assertEqual(parser_mediator.timezone, pytz.UTC)
+
+    with self.assertRaises(ValueError):
+      parser_mediator.SetPreferredTimeZone('bogus')
+
   def testSetStorageWriter(self):
     """Tests the SetStorageWriter function."""
     knowledge_base_object = knowledge_base.KnowledgeBase()
@@ -242,6 +500,36 @@ class ParsersMediatorTest(test_lib.ParserTestCase):
 
     parser_mediator.SignalAbort()
 
+  def testStartAndStopProfiling(self):
+    """Tests the StartProfiling and StopProfiling functions."""
+    knowledge_base_object = knowledge_base.KnowledgeBase()
+    parser_mediator = mediator.ParserMediator(knowledge_base_object)
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      configuration = configurations.ProfilingConfiguration()
+      configuration.directory = temp_directory
+      configuration.profilers = set(['parsers'])
+
+      process_information = process_info.ProcessInfo(os.getpid())
+
+      parser_mediator.StartProfiling(None, 'test', process_information)
+      self.assertFalse(parser_mediator._profiling_enabled)
+
+      parser_mediator.StartProfiling(
+          configuration, 'test', process_information)
+      self.assertTrue(parser_mediator._profiling_enabled)
+
+      parser_mediator.SampleStartTiming('test')
+      parser_mediator.SampleStopTiming('test')
+      parser_mediator.SampleMemoryUsage('test')
+
+      parser_mediator.StopProfiling()
+      self.assertFalse(parser_mediator._profiling_enabled)
+
+      parser_mediator.SampleStartTiming('test')
+      parser_mediator.SampleStopTiming('test')
+      parser_mediator.SampleMemoryUsage('test')
+
 
 if __name__ == '__main__':
   unittest.main()
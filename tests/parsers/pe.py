@@ -9,7 +9,6 @@ from dfvfs.lib import definitions as dfvfs_definitions
 from dfvfs.path import factory as path_spec_factory
 from dfvfs.resolver import resolver as path_spec_resolver
 
-from plaso.containers import artifacts
 from plaso.parsers import pe
 from plaso.parsers import mediator as parsers_mediator
 
@@ -102,13 +101,12 @@ class PECOFFTest(test_lib.ParserTestCase):
 
     knowledge_base_object = self._CreateKnowledgeBase()
 
-    parser_mediator = parsers_mediator.ParserMediator(knowledge_base_object)
+    knowledge_base_object._windows_eventlog_providers_per_path = {
+        os.path.dirname(test_file_path).lower(): {
+            'wrc-test-wevt_template.dll': 'wrc-test-wevt_template.dll'}}
 
-    test_event_provider = artifacts.WindowsEventLogMessageFileArtifact()
+    parser_mediator = parsers_mediator.ParserMediator(knowledge_base_object)
     parser_mediator._extract_winevt_resources = True
-    parser_mediator._windows_event_log_providers_per_path = {
-        os.path.dirname(test_file_path).lower(): {
-            'wrc-test-wevt_template.dll': test_event_provider}}
 
     storage_writer = self._CreateStorageWriter()
     parser_mediator.SetStorageWriter(storage_writer)
@@ -4,6 +4,10 @@
 
 import unittest
 
+from dfvfs.helpers import fake_file_system_builder
+
+from plaso.lib import errors
+from plaso.parsers import text_parser
 from plaso.parsers.text_plugins import setupapi
 
 from tests.parsers.text_plugins import test_lib
@@ -12,6 +16,155 @@ from tests.parsers.text_plugins import test_lib
 class SetupAPILogTextPluginTest(test_lib.TextPluginTestCase):
   """Tests for the Windows SetupAPI log text parser plugin."""
 
+  # pylint: disable=protected-access
+
+  def testCheckRequiredFormat(self):
+    """Tests for the CheckRequiredFormat method."""
+    plugin = setupapi.SetupAPILogTextPlugin()
+
+    file_system_builder = fake_file_system_builder.FakeFileSystemBuilder()
+    file_system_builder.AddFile('/file.txt', (
+        b'\xef\xbb\xbf[Device Install Log]\r\n'
+        b'     OS Version = 10.0.14393\r\n'))
+    file_system_builder.AddFile('/other.txt', (
+        b'Start-Date: 2019-07-10  16:38:08\n'
+        b'[Device Install Log]\n'))
+
+    file_entry = file_system_builder.file_system.GetFileEntryByPath('/file.txt')
+
+    parser_mediator = self._CreateParserMediator(None, file_entry=file_entry)
+
+    file_object = file_entry.GetFileObject()
+    text_reader = text_parser.EncodedTextReader(file_object)
+    text_reader.ReadLines()
+
+    result = plugin.CheckRequiredFormat(parser_mediator, text_reader)
+    self.assertTrue(result)
+
+    file_entry = file_system_builder.file_system.GetFileEntryByPath(
+        '/other.txt')
+
+    parser_mediator = self._CreateParserMediator(None, file_entry=file_entry)
+
+    file_object = file_entry.GetFileObject()
+    text_reader = text_parser.EncodedTextReader(file_object)
+    text_reader.ReadLines()
+
+    result = plugin.CheckRequiredFormat(parser_mediator, text_reader)
+    self.assertFalse(result)
+
+  def testParseRecord(self):
+    """Tests the _ParseRecord function."""
+    plugin = setupapi.SetupAPILogTextPlugin()
+    storage_writer = self._CreateStorageWriter()
+    parser_mediator = self._CreateParserMediator(storage_writer)
+
+    test_lines = [
+        '>>>  [Device Install - A]',
+        '>>>  Section start 2018/01/01 10:00:00.000',
+        '>>>  Section start 2018/02/02 11:00:00.000',
+        '<<<  Section end 2018/02/02 11:00:01.000',
+        '<<<  [Exit status: SUCCESS]',
+        '>>>  [Device Install - B]',
+        '>>>  Section start 2018/03/03 12:00:00.000',
+        '<<<  Section end 2018/03/03 12:00:01.000',
+        '<<<  [Exit status: FAILURE(0x00000001)]']
+
+    number_of_parse_errors = 0
+    for line in test_lines:
+      key, structure, _, _ = plugin._ParseString(line)
+      try:
+        plugin._ParseRecord(parser_mediator, key, structure)
+      except errors.ParseError:
+        number_of_parse_errors += 1
+
+    # The second section start, which has no section header, discards section
+    # A instead of storing its values in the event data of section A.
+    self.assertEqual(number_of_parse_errors, 3)
+
+    number_of_event_data = storage_writer.GetNumberOfAttributeContainers(
+        'event_data')
+    self.assertEqual(number_of_event_data, 1)
+
+    expected_event_values = {
+        'data_type': 'setupapi:log:line',
+        'end_time': '2018-03-03T12:00:01.000',
+        'entry_type': 'Device Install - B',
+        'exit_status': 'FAILURE(0x00000001)',
+        'start_time': '2018-03-03T12:00:00.000'}
+
+    event_data = storage_writer.GetAttributeContainerByIndex('event_data', 0)
+    self.CheckEventData(event_data, expected_event_values)
+
+  def testParseString(self):
+    """Tests the _ParseString function."""
+    plugin = setupapi.SetupAPILogTextPlugin()
+
+    test_lines = [
+        ('[Device Install Log]', 'ignorable_line'),
+        ('     OS Version = 10.0.14393', 'ignorable_line'),
+        ('[BeginLog]', 'ignorable_line'),
+        ('[Boot Session: 2016/10/12 03:32:36.500]', 'ignorable_line'),
+        ('>>>  [Device Install (Hardware initiated) - SWD\\IP_TUNNEL_VBUS]',
+         'section_header'),
+        ('>>>  Section start 2016/10/12 03:36:30.936', 'section_start'),
+        ('     ump: Creating Install Process: DrvInst.exe 03:36:30.936',
+         'ignorable_line'),
+        ('!!!  dvi: Device not started: Device has problem', 'ignorable_line'),
+        ('<<<  Section end 2016/10/12 03:36:30,998', 'section_end'),
+        ('<<<  [Exit status: SUCCESS]', 'section_end_exit_status')]
+
+    for line, expected_key in test_lines:
+      key, _, start, end = plugin._ParseString(line + '\nbogus\n')
+      self.assertEqual(key, expected_key)
+      self.assertEqual(start, 0)
+      self.assertEqual(end, len(line) + 1)
+
+    section_body_lines = (
+        '     ndv: Retrieving device info...\n'
+        '!    dvi: Device not started\n'
+        '     dvi: {Build Driver List} 03:36:30.967\n')
+    key, _, start, end = plugin._ParseString(
+        section_body_lines + '<<<  Section end 2016/10/12 03:36:30.998\n')
+    self.assertEqual(key, 'ignorable_line')
+    self.assertEqual(start, 0)
+    self.assertEqual(end, len(section_body_lines))
+
+    _, structure, _, _ = plugin._ParseString(
+        '<<<  [Exit status: FAILURE(0xe0000219)]')
+    self.assertEqual(structure.group(1), 'FAILURE(0xe0000219)')
+
+    with self.assertRaises(errors.ParseError):
+      plugin._ParseString('')
+
+    with self.assertRaises(errors.ParseError):
+      plugin._ParseString('>>>  Section start 2016/10/12\n')
+
+  def testParseTimeElements(self):
+    """Tests the _ParseTimeElements function."""
+    plugin = setupapi.SetupAPILogTextPlugin()
+
+    setupapi.SetupAPILogTextPlugin._ParseTimeElements.cache_clear()
+
+    date_time = plugin._ParseTimeElements('2016/10/12 03:36:30.936')
+    self.assertEqual(
+        date_time.CopyToDateTimeString(), '2016-10-12 03:36:30.936')
+    self.assertTrue(date_time.is_local_time)
+
+    cached_date_time = plugin._ParseTimeElements('2016/10/12 03:36:30.936')
+    self.assertIs(cached_date_time, date_time)
+
+    cache_info = setupapi.SetupAPILogTextPlugin._ParseTimeElements.cache_info()
+    self.assertEqual(cache_info.hits, 1)
+    self.assertEqual(cache_info.misses, 1)
+
+    date_time = plugin._ParseTimeElements('2015/11/22  17:57:17,502')
+    self.assertEqual(
+        date_time.CopyToDateTimeString(), '2015-11-22 17:57:17.502')
+
+    with self.assertRaises(errors.ParseError):
+      plugin._ParseTimeElements('2016/13/12 03:36:30.936')
+
   def testProcessWithDevLog(self):
     """Tests the Process function with setupapi.dev.log."""
     plugin = setupapi.SetupAPILogTextPlugin()
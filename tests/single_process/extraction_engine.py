@@ -3,6 +3,7 @@
 """Tests the single process processing engine."""
 
 import collections
+import os
 import unittest
 
 from dfvfs.lib import definitions as dfvfs_definitions
@@ -88,6 +89,51 @@ class SingleProcessEngineTest(shared_test_lib.BaseTestCase):
         'total': 15})
     self.assertEqual(parsers_counter, expected_parsers_counter)
 
+  def testProcessSourcesWithDirectory(self):
+    """Tests the ProcessSources function with a directory."""
+    timeliner_file_path = self._GetDataFilePath(['timeliner.yaml'])
+    self._SkipIfPathNotExists(timeliner_file_path)
+
+    test_engine = extraction_engine.SingleProcessEngine()
+    resolver_context = context.Context()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      test_file_path = os.path.join(temp_directory, 'test.txt')
+      with open(test_file_path, 'w', encoding='utf-8') as file_object:
+        file_object.write('test\n')
+
+      source_path_spec = path_spec_factory.Factory.NewPathSpec(
+          dfvfs_definitions.TYPE_INDICATOR_OS, location=temp_directory)
+
+      source_configuration = artifacts.SourceConfigurationArtifact(
+          path_spec=source_path_spec)
+
+      configuration = configurations.ProcessingConfiguration()
+      configuration.data_location = shared_test_lib.DATA_PATH
+      configuration.parser_filter_expression = 'filestat'
+
+      storage_writer = fake_writer.FakeStorageWriter()
+      storage_writer.Open()
+
+      try:
+        processing_status = test_engine.ProcessSources(
+            [source_configuration], storage_writer, resolver_context,
+            configuration)
+
+        number_of_event_sources = (
+            storage_writer.GetNumberOfAttributeContainers('event_source'))
+        number_of_event_data = storage_writer.GetNumberOfAttributeContainers(
+            'event_data')
+
+      finally:
+        storage_writer.Close()
+
+    self.assertFalse(processing_status.aborted)
+
+    # The directory and the file each produce an event source and event data.
+    self.assertEqual(number_of_event_sources, 2)
+    self.assertEqual(number_of_event_data, 2)
+
 
 if __name__ == '__main__':
   unittest.main()